@@ -0,0 +1,349 @@
+from fastapi import HTTPException, Request, status
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fastapi_app.core.etag import etag_matches, make_etag
+from fastapi_app.core.pagination import InvalidCursorError
+from fastapi_app.core.response_cache import (
+    get_cache_key,
+    get_comment_tags,
+    get_post_tags,
+    response_cache,
+)
+from fastapi_app.models.user import User
+from fastapi_app.schemas.user import UserUpdateRequest
+from fastapi_app.services.comment_service import (
+    get_post_comments,
+    get_user_liked_comment_ids,
+    to_comment_item,
+)
+from fastapi_app.services.follow_service import user_exists
+from fastapi_app.services.post_service import (
+    get_post_by_id,
+    get_post_etag_marker,
+    get_post_item_with_marker,
+    get_post_items_by_ids,
+    get_posts,
+    get_posts_by_user,
+)
+from fastapi_app.services.timeline_service import get_home_timeline
+from fastapi_app.services.user_service import (
+    get_user_by_id,
+    get_user_conflict_for_update,
+    get_user_version,
+    to_user_public_profile,
+    update_user,
+)
+
+
+def validate_pagination(page: int, per_page: int) -> None:
+    if page < 1 or per_page < 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="page and per_page must be greater than 0",
+        )
+
+
+def invalid_cursor_error() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Invalid cursor",
+    )
+
+
+def not_found_error(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=detail)
+
+
+async def read_posts(
+    request: Request,
+    db: AsyncSession,
+    page: int,
+    per_page: int,
+    cursor: str | None,
+    include_total: bool,
+    approximate_total: bool,
+    ids: list[int] | None,
+    viewer_id: int | None,
+) -> dict:
+    validate_pagination(page=page, per_page=per_page)
+
+    cache_key = get_cache_key(request, viewer_id=viewer_id)
+    cached, cache_token = await response_cache.get(cache_key)
+    if cached is not None:
+        return cached.content
+
+    if ids is not None:
+        post_items = await get_post_items_by_ids(
+            db=db, post_ids=ids, viewer_id=viewer_id
+        )
+        content = {"posts": post_items}
+        await response_cache.set(
+            cache_key, content, tags=get_post_tags(post_items), token=cache_token
+        )
+        return content
+
+    try:
+        total, post_items, next_cursor = await get_posts(
+            db=db,
+            page=page,
+            per_page=per_page,
+            cursor=cursor,
+            include_total=include_total,
+            approximate_total=approximate_total,
+            viewer_id=viewer_id,
+        )
+    except InvalidCursorError:
+        raise invalid_cursor_error()
+
+    content = {
+        "page": page,
+        "per_page": per_page,
+        "total": total,
+        "next_cursor": next_cursor,
+        "posts": post_items,
+    }
+    await response_cache.set(
+        cache_key,
+        content,
+        tags={"posts", *get_post_tags(post_items)},
+        token=cache_token,
+    )
+
+    return content
+
+
+async def read_post_detail(
+    request: Request,
+    db: AsyncSession,
+    post_id: int,
+    if_none_match: str | None,
+    viewer_id: int | None,
+) -> tuple[dict | None, str]:
+    cache_key = get_cache_key(request, viewer_id=viewer_id)
+    cached, cache_token = await response_cache.get(cache_key)
+    if cached is not None:
+        etag = cached.headers["ETag"]
+        if etag_matches(if_none_match, etag):
+            return None, etag
+        return cached.content, etag
+
+    if if_none_match:
+        marker = await get_post_etag_marker(db=db, post_id=post_id, viewer_id=viewer_id)
+
+        if not marker:
+            raise not_found_error("Post not found")
+
+        etag = make_etag("post", post_id, viewer_id, *marker)
+        if etag_matches(if_none_match, etag):
+            return None, etag
+
+    result = await get_post_item_with_marker(
+        db=db, post_id=post_id, viewer_id=viewer_id
+    )
+
+    if not result:
+        raise not_found_error("Post not found")
+
+    post_item, marker = result
+    etag = make_etag("post", post_id, viewer_id, *marker)
+
+    await response_cache.set(
+        cache_key,
+        post_item,
+        tags=get_post_tags([post_item]),
+        headers={"ETag": etag},
+        token=cache_token,
+    )
+
+    return post_item, etag
+
+
+async def read_post_comments(
+    request: Request,
+    db: AsyncSession,
+    post_id: int,
+    page: int,
+    per_page: int,
+    cursor: str | None,
+    include_total: bool,
+    viewer_id: int | None,
+) -> dict:
+    validate_pagination(page=page, per_page=per_page)
+
+    cache_key = get_cache_key(request, viewer_id=viewer_id)
+    cached, cache_token = await response_cache.get(cache_key)
+    if cached is not None:
+        return cached.content
+
+    if not await get_post_by_id(db=db, post_id=post_id):
+        raise not_found_error("Post not found")
+
+    try:
+        total, comments, next_cursor = await get_post_comments(
+            db=db,
+            post_id=post_id,
+            page=page,
+            per_page=per_page,
+            cursor=cursor,
+            include_total=include_total,
+        )
+    except InvalidCursorError:
+        raise invalid_cursor_error()
+    liked_comment_ids = await get_user_liked_comment_ids(
+        db=db,
+        user_id=viewer_id,
+        comment_ids=[comment.id for comment in comments],
+    )
+    comment_items = [
+        to_comment_item(comment, is_liked=comment.id in liked_comment_ids)
+        for comment in comments
+    ]
+
+    content = {
+        "page": page,
+        "per_page": per_page,
+        "total": total,
+        "next_cursor": next_cursor,
+        "comments": comment_items,
+    }
+    await response_cache.set(
+        cache_key,
+        content,
+        tags={f"comments:{post_id}", *get_comment_tags(comment_items)},
+        token=cache_token,
+    )
+
+    return content
+
+
+async def read_user_profile(
+    db: AsyncSession, user_id: int, if_none_match: str | None
+) -> tuple[dict | None, str]:
+    if if_none_match:
+        version = await get_user_version(db=db, user_id=user_id)
+
+        if version is None:
+            raise not_found_error("User not found")
+
+        etag = make_etag("user", user_id, version)
+        if etag_matches(if_none_match, etag):
+            return None, etag
+
+    user = await get_user_by_id(db=db, user_id=user_id)
+
+    if not user:
+        raise not_found_error("User not found")
+
+    return to_user_public_profile(user), make_etag("user", user_id, user.version)
+
+
+async def read_user_posts(
+    request: Request,
+    db: AsyncSession,
+    user_id: int,
+    page: int,
+    per_page: int,
+    cursor: str | None,
+    include_total: bool,
+    viewer_id: int | None,
+) -> dict:
+    validate_pagination(page=page, per_page=per_page)
+
+    cache_key = get_cache_key(request, viewer_id=viewer_id)
+    cached, cache_token = await response_cache.get(cache_key)
+    if cached is not None:
+        return cached.content
+
+    if not await user_exists(db=db, user_id=user_id):
+        raise not_found_error("User not found")
+
+    try:
+        total, post_items, next_cursor = await get_posts_by_user(
+            db=db,
+            user_id=user_id,
+            page=page,
+            per_page=per_page,
+            cursor=cursor,
+            include_total=include_total,
+            viewer_id=viewer_id,
+        )
+    except InvalidCursorError:
+        raise invalid_cursor_error()
+
+    content = {
+        "page": page,
+        "per_page": per_page,
+        "total": total,
+        "next_cursor": next_cursor,
+        "posts": post_items,
+    }
+    await response_cache.set(
+        cache_key,
+        content,
+        tags={f"user_posts:{user_id}", *get_post_tags(post_items)},
+        token=cache_token,
+    )
+
+    return content
+
+
+async def read_feed(
+    db: AsyncSession,
+    user_id: int,
+    page: int,
+    per_page: int,
+    cursor: str | None,
+    include_total: bool,
+) -> dict:
+    validate_pagination(page=page, per_page=per_page)
+
+    try:
+        total, post_ids, next_cursor = await get_home_timeline(
+            db=db,
+            user_id=user_id,
+            page=page,
+            per_page=per_page,
+            cursor=cursor,
+            include_total=include_total,
+        )
+    except InvalidCursorError:
+        raise invalid_cursor_error()
+    post_items = await get_post_items_by_ids(
+        db=db,
+        post_ids=post_ids,
+        viewer_id=user_id,
+    )
+
+    return {
+        "page": page,
+        "per_page": per_page,
+        "total": total,
+        "next_cursor": next_cursor,
+        "posts": post_items,
+    }
+
+
+async def update_current_user(
+    db: AsyncSession, user: User, payload: UserUpdateRequest
+) -> User:
+    conflict_user = await get_user_conflict_for_update(
+        db=db,
+        user_id=user.id,
+        username=payload.username,
+        email=payload.email,
+    )
+
+    if conflict_user:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Username or email already exists",
+        )
+
+    try:
+        return await update_user(db=db, user=user, payload=payload)
+    except SQLAlchemyError:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Database error",
+        )
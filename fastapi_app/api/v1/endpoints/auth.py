@@ -1,8 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from fastapi_app.db.session import get_db
+from fastapi_app.db.session import get_async_db
 from fastapi_app.dependencies import get_refresh_user_id
 from fastapi_app.core.security import create_access_token, create_refresh_token
 from fastapi_app.schemas.auth import (
@@ -13,6 +13,7 @@ from fastapi_app.schemas.auth import (
     AccessTokenResponse,
 )
 from fastapi_app.services.auth_service import (
+    PasswordPoolFullError,
     authenticate_user,
     get_user_by_username_or_email,
     register_user,
@@ -27,8 +28,8 @@ router = APIRouter(
 @router.post(
     "/register", response_model=MessageResponse, status_code=status.HTTP_201_CREATED
 )
-def register(payload: RegisterRequest, db: Session = Depends(get_db)):
-    existing_user = get_user_by_username_or_email(
+async def register(payload: RegisterRequest, db: AsyncSession = Depends(get_async_db)):
+    existing_user = await get_user_by_username_or_email(
         db=db,
         username=payload.username,
         email=payload.email,
@@ -41,7 +42,13 @@ def register(payload: RegisterRequest, db: Session = Depends(get_db)):
         )
 
     try:
-        register_user(db=db, payload=payload)
+        await register_user(db=db, payload=payload)
+    except PasswordPoolFullError:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many password requests, try again later",
+            headers={"Retry-After": "1"},
+        )
     except SQLAlchemyError:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -52,8 +59,15 @@ def register(payload: RegisterRequest, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=TokenResponse)
-def login(payload: LoginRequest, db: Session = Depends(get_db)):
-    user = authenticate_user(db=db, payload=payload)
+async def login(payload: LoginRequest, db: AsyncSession = Depends(get_async_db)):
+    try:
+        user = await authenticate_user(db=db, payload=payload)
+    except PasswordPoolFullError:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many password requests, try again later",
+            headers={"Retry-After": "1"},
+        )
 
     if not user:
         raise HTTPException(
@@ -70,6 +84,6 @@ def login(payload: LoginRequest, db: Session = Depends(get_db)):
 
 
 @router.post("/refresh", response_model=AccessTokenResponse)
-def refresh(user_id: int = Depends(get_refresh_user_id)):
+async def refresh(user_id: int = Depends(get_refresh_user_id)):
     access_token = create_access_token(user_id=user_id)
     return {"access_token": access_token}
@@ -1,10 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session
-
-from fastapi_app.db.session import get_db
-from fastapi_app.dependencies import get_current_user
-from fastapi_app.models.user import User
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fastapi_app.api.handlers import validate_pagination
+from fastapi_app.core.pagination import InvalidCursorError
+from fastapi_app.core.responses import json_response
+from fastapi_app.db.session import get_async_db
+from fastapi_app.dependencies import get_current_user_id, get_read_db
 from fastapi_app.schemas.auth import MessageResponse
 from fastapi_app.schemas.comment import (
     CommentCreatedResponse,
@@ -16,13 +18,13 @@ from fastapi_app.services.comment_service import (
     create_comment,
     delete_comment,
     get_comment_by_id,
-    get_comment_like,
     get_comment_like_users,
     like_comment,
     post_exists,
     unlike_comment,
     update_comment,
 )
+from fastapi_app.services.user_service import to_user_list_item
 
 router = APIRouter(
     prefix="/comments",
@@ -30,29 +32,21 @@ router = APIRouter(
 )
 
 
-def validate_pagination(page: int, per_page: int) -> None:
-    if page < 1 or per_page < 1:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="page and per_page must be greater than 0",
-        )
-
-
 @router.post(
     "", response_model=CommentCreatedResponse, status_code=status.HTTP_201_CREATED
 )
-def create_comment_endpoint(
+async def create_comment_endpoint(
     payload: CommentCreateRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    if not post_exists(db=db, post_id=payload.post_id):
+    if not await post_exists(db=db, post_id=payload.post_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Post not found"
         )
 
     try:
-        comment = create_comment(db=db, user_id=current_user.id, payload=payload)
+        comment = await create_comment(db=db, user_id=current_user_id, payload=payload)
     except SQLAlchemyError:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -69,26 +63,26 @@ def create_comment_endpoint(
 
 
 @router.put("/{comment_id}", response_model=CommentCreatedResponse)
-def update_comment_endpoint(
+async def update_comment_endpoint(
     comment_id: int,
     payload: CommentUpdateRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    comment = get_comment_by_id(db=db, comment_id=comment_id)
+    comment = await get_comment_by_id(db=db, comment_id=comment_id)
 
     if not comment:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Comment not found"
         )
 
-    if comment.user_id != current_user.id:
+    if comment.user_id != current_user_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail="Permission denied"
         )
 
     try:
-        updated_comment = update_comment(db=db, comment=comment, payload=payload)
+        updated_comment = await update_comment(db=db, comment=comment, payload=payload)
     except SQLAlchemyError:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -105,25 +99,25 @@ def update_comment_endpoint(
 
 
 @router.delete("/{comment_id}", response_model=MessageResponse)
-def delete_comment_endpoint(
+async def delete_comment_endpoint(
     comment_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    comment = get_comment_by_id(db=db, comment_id=comment_id)
+    comment = await get_comment_by_id(db=db, comment_id=comment_id)
 
     if not comment:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Comment not found"
         )
 
-    if comment.user_id != current_user.id:
+    if comment.user_id != current_user_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail="Permission denied"
         )
 
     try:
-        delete_comment(db=db, comment=comment)
+        await delete_comment(db=db, comment=comment)
     except SQLAlchemyError:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -134,95 +128,108 @@ def delete_comment_endpoint(
 
 
 @router.post("/{comment_id}/like", response_model=MessageResponse)
-def like_comment_endpoint(
+async def like_comment_endpoint(
     comment_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    idempotent: bool = False,
+    current_user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    if not get_comment_by_id(db=db, comment_id=comment_id):
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Comment not found"
+    try:
+        liked = await like_comment(
+            db=db, user_id=current_user_id, comment_id=comment_id
         )
-
-    if get_comment_like(db=db, user_id=current_user.id, comment_id=comment_id):
+    except IntegrityError:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST, detail="Already liked"
+            status_code=status.HTTP_404_NOT_FOUND, detail="Comment not found"
         )
-
-    try:
-        like_comment(db=db, user_id=current_user.id, comment_id=comment_id)
     except SQLAlchemyError:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Database error",
         )
 
+    if not liked:
+        if not await get_comment_by_id(db=db, comment_id=comment_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Comment not found"
+            )
+        if not idempotent:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Already liked"
+            )
+
     return {"message": "Like comment successfully"}
 
 
 @router.delete("/{comment_id}/like", response_model=MessageResponse)
 @router.delete("/{comment_id}/unlike", response_model=MessageResponse)
-def unlike_comment_endpoint(
+async def unlike_comment_endpoint(
     comment_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    idempotent: bool = False,
+    current_user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    if not get_comment_by_id(db=db, comment_id=comment_id):
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Comment not found"
-        )
-
-    like = get_comment_like(db=db, user_id=current_user.id, comment_id=comment_id)
-
-    if not like:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="You have not liked this comment",
-        )
-
     try:
-        unlike_comment(db=db, like=like)
+        unliked = await unlike_comment(
+            db=db, user_id=current_user_id, comment_id=comment_id
+        )
     except SQLAlchemyError:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Database error",
         )
 
+    if not unliked:
+        if not await get_comment_by_id(db=db, comment_id=comment_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Comment not found"
+            )
+        if not idempotent:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="You have not liked this comment",
+            )
+
     return {"message": "Unlike comment successfully"}
 
 
 @router.get("/{comment_id}/like", response_model=CommentLikeUsersResponse)
-def get_comment_likes_endpoint(
+async def get_comment_likes_endpoint(
     comment_id: int,
     page: int = 1,
     per_page: int = 10,
-    db: Session = Depends(get_db),
+    cursor: str | None = None,
+    include_total: bool = True,
+    db: AsyncSession = Depends(get_read_db),
 ):
     validate_pagination(page=page, per_page=per_page)
 
-    if not get_comment_by_id(db=db, comment_id=comment_id):
+    if not await get_comment_by_id(db=db, comment_id=comment_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Comment not found"
         )
 
-    total, users = get_comment_like_users(
-        db=db,
-        comment_id=comment_id,
-        page=page,
-        per_page=per_page,
-    )
+    try:
+        total, users, next_cursor = await get_comment_like_users(
+            db=db,
+            comment_id=comment_id,
+            page=page,
+            per_page=per_page,
+            cursor=cursor,
+            include_total=include_total,
+        )
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
 
-    return {
-        "page": page,
-        "per_page": per_page,
-        "total": total,
-        "data": [
-            {
-                "id": user.id,
-                "username": user.username,
-                "full_name": user.full_name,
-                "avatar": user.avatar,
-            }
-            for user in users
-        ],
-    }
+    return json_response(
+        {
+            "page": page,
+            "per_page": per_page,
+            "total": total,
+            "next_cursor": next_cursor,
+            "data": [to_user_list_item(user) for user in users],
+        }
+    )
@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fastapi_app.api.handlers import read_feed
+from fastapi_app.api.v1.envelopes import post_page_envelope
+from fastapi_app.core.responses import json_response
+from fastapi_app.dependencies import get_current_user_id, get_read_db
+from fastapi_app.schemas.post import PostListResponse
+
+router = APIRouter(
+    prefix="/feed",
+    tags=["feed"],
+)
+
+
+@router.get("", response_model=PostListResponse)
+async def get_feed(
+    page: int = 1,
+    per_page: int = 10,
+    limit: int | None = None,
+    cursor: str | None = None,
+    include_total: bool = True,
+    current_user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db),
+):
+    content = await read_feed(
+        db=db,
+        user_id=current_user_id,
+        page=page,
+        per_page=limit if limit is not None else per_page,
+        cursor=cursor,
+        include_total=include_total,
+    )
+
+    return json_response(post_page_envelope(content))
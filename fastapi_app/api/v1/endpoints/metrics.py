@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends
+
+from fastapi_app.core.response_cache import response_cache
+from fastapi_app.core.security import verified_token_cache
+from fastapi_app.db.pool import get_pool_status
+from fastapi_app.dependencies import require_metrics_token
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["metrics"],
+    dependencies=[Depends(require_metrics_token)],
+)
+
+
+@router.get("/db-pool")
+async def get_db_pool_metrics():
+    return get_pool_status()
+
+
+@router.get("/token-cache")
+async def get_token_cache_metrics():
+    return verified_token_cache.snapshot()
+
+
+@router.get("/response-cache")
+async def get_response_cache_metrics():
+    return response_cache.snapshot()
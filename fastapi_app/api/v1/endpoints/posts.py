@@ -1,15 +1,41 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session
-
-from fastapi_app.db.session import get_db
-from fastapi_app.dependencies import get_current_user, get_optional_current_user_id
-from fastapi_app.models.post import Post
-from fastapi_app.models.user import User
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Request,
+    Response,
+    status,
+)
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fastapi_app.api.handlers import (
+    read_post_comments,
+    read_post_detail,
+    read_posts,
+    validate_pagination,
+)
+from fastapi_app.api.v1.envelopes import (
+    comment_page_envelope,
+    post_envelope,
+    post_page_envelope,
+)
+from fastapi_app.core.etag import not_modified_response, set_etag_headers
+from fastapi_app.core.pagination import InvalidCursorError
+from fastapi_app.core.responses import json_response
+from fastapi_app.db.session import get_async_db
+from fastapi_app.dependencies import (
+    get_batch_ids,
+    get_current_user_id,
+    get_optional_current_user_id,
+    get_read_db,
+)
 from fastapi_app.schemas.auth import MessageResponse
 from fastapi_app.schemas.comment import CommentListResponse
 from fastapi_app.schemas.post import (
     LikeUsersResponse,
+    PostBatchResponse,
     PostCreateRequest,
     PostCreatedResponse,
     PostDetailResponse,
@@ -17,24 +43,16 @@ from fastapi_app.schemas.post import (
     PostListResponse,
     PostUpdateRequest,
 )
-from fastapi_app.services.comment_service import (
-    get_post_comments,
-    get_user_liked_comment_ids,
-)
 from fastapi_app.services.post_service import (
     create_post,
     delete_post,
     get_post_by_id,
-    get_post_comment_counts,
-    get_post_like,
-    get_post_like_counts,
     get_post_like_users,
-    get_posts,
-    get_user_liked_post_ids,
     like_post,
     unlike_post,
     update_post,
 )
+from fastapi_app.services.user_service import to_user_list_item
 
 router = APIRouter(
     prefix="/posts",
@@ -42,44 +60,16 @@ router = APIRouter(
 )
 
 
-def serialize_post(
-    post: Post,
-    likes_count: int,
-    comment_count: int,
-    is_liked: bool,
-) -> dict:
-    return {
-        "id": post.id,
-        "user_id": post.user_id,
-        "content": post.content,
-        "created_at": post.created_at,
-        "username": post.user.username,
-        "avatar": post.user.avatar,
-        "images": [image.image_url for image in post.images],
-        "likes": likes_count,
-        "is_liked": is_liked,
-        "comment_count": comment_count,
-    }
-
-
-def validate_pagination(page: int, per_page: int) -> None:
-    if page < 1 or per_page < 1:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="page and per_page must be greater than 0",
-        )
-
-
 @router.post(
     "", response_model=PostCreatedResponse, status_code=status.HTTP_201_CREATED
 )
-def create_post_endpoint(
+async def create_post_endpoint(
     payload: PostCreateRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db),
 ):
     try:
-        post = create_post(db=db, user_id=current_user.id, payload=payload)
+        post = await create_post(db=db, user_id=current_user_id, payload=payload)
     except SQLAlchemyError:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -89,107 +79,81 @@ def create_post_endpoint(
     return {"id": post.id, "message": "Create post successfully"}
 
 
-@router.get("", response_model=PostListResponse)
-def get_posts_endpoint(
+@router.get("", response_model=PostListResponse | PostBatchResponse)
+async def get_posts_endpoint(
+    request: Request,
     page: int = 1,
     per_page: int = 10,
     limit: int | None = None,
+    cursor: str | None = None,
+    include_total: bool = True,
+    approximate_total: bool = False,
+    ids: list[int] | None = Depends(get_batch_ids),
     current_user_id: int | None = Depends(get_optional_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    if limit is not None:
-        per_page = limit
-
-    validate_pagination(page=page, per_page=per_page)
-
-    total, posts = get_posts(db=db, page=page, per_page=per_page)
-    post_ids = [post.id for post in posts]
-    likes_counts = get_post_like_counts(db=db, post_ids=post_ids)
-    comment_counts = get_post_comment_counts(db=db, post_ids=post_ids)
-    liked_post_ids = get_user_liked_post_ids(
+    content = await read_posts(
+        request=request,
         db=db,
-        user_id=current_user_id,
-        post_ids=post_ids,
+        page=page,
+        per_page=limit if limit is not None else per_page,
+        cursor=cursor,
+        include_total=include_total,
+        approximate_total=approximate_total,
+        ids=ids,
+        viewer_id=current_user_id,
     )
 
-    post_items = [
-        serialize_post(
-            post=post,
-            likes_count=likes_counts.get(post.id, 0),
-            comment_count=comment_counts.get(post.id, 0),
-            is_liked=post.id in liked_post_ids,
-        )
-        for post in posts
-    ]
-
-    return {
-        "page": page,
-        "per_page": per_page,
-        "total": total,
-        "posts": post_items,
-        "status": "success",
-        "data": {
-            "page": page,
-            "per_page": per_page,
-            "total_post": total,
-            "posts": post_items,
-        },
-    }
+    if ids is not None:
+        return json_response(content)
+    return json_response(post_page_envelope(content))
 
 
 @router.get("/{post_id}", response_model=PostDetailResponse)
-def get_post_detail_endpoint(
+async def get_post_detail_endpoint(
     post_id: int,
+    request: Request,
+    response: Response,
+    if_none_match: str | None = Header(default=None),
     current_user_id: int | None = Depends(get_optional_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    post = get_post_by_id(db=db, post_id=post_id)
-
-    if not post:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Post not found",
-        )
-
-    likes_counts = get_post_like_counts(db=db, post_ids=[post.id])
-    comment_counts = get_post_comment_counts(db=db, post_ids=[post.id])
-    liked_post_ids = get_user_liked_post_ids(
+    post_item, etag = await read_post_detail(
+        request=request,
         db=db,
-        user_id=current_user_id,
-        post_ids=[post.id],
+        post_id=post_id,
+        if_none_match=if_none_match,
+        viewer_id=current_user_id,
     )
 
-    post_item = serialize_post(
-        post=post,
-        likes_count=likes_counts.get(post.id, 0),
-        comment_count=comment_counts.get(post.id, 0),
-        is_liked=post.id in liked_post_ids,
-    )
+    if post_item is None:
+        return not_modified_response(etag)
 
-    return {"post": post_item, "status": "success", "data": {"post": post_item}}
+    set_etag_headers(response, etag)
+    return json_response(post_envelope(post_item), response=response)
 
 
 @router.put("/{post_id}", response_model=MessageResponse)
-def update_post_endpoint(
+async def update_post_endpoint(
     post_id: int,
     payload: PostUpdateRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    post = get_post_by_id(db=db, post_id=post_id)
+    post = await get_post_by_id(db=db, post_id=post_id)
 
     if not post:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Post not found"
         )
 
-    if post.user_id != current_user.id:
+    if post.user_id != current_user_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail="Permission denied"
         )
 
     try:
-        update_post(db=db, post=post, payload=payload)
+        await update_post(db=db, post=post, payload=payload)
     except SQLAlchemyError:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -200,25 +164,25 @@ def update_post_endpoint(
 
 
 @router.delete("/{post_id}", response_model=MessageResponse)
-def delete_post_endpoint(
+async def delete_post_endpoint(
     post_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    post = get_post_by_id(db=db, post_id=post_id)
+    post = await get_post_by_id(db=db, post_id=post_id)
 
     if not post:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Post not found"
         )
 
-    if post.user_id != current_user.id:
+    if post.user_id != current_user_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail="Permission denied"
         )
 
     try:
-        delete_post(db=db, post=post)
+        await delete_post(db=db, post=post)
     except SQLAlchemyError:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -229,157 +193,130 @@ def delete_post_endpoint(
 
 
 @router.get("/{post_id}/comments", response_model=CommentListResponse)
-def get_post_comments_endpoint(
+async def get_post_comments_endpoint(
     post_id: int,
+    request: Request,
     page: int = 1,
     per_page: int = 10,
     limit: int | None = None,
+    cursor: str | None = None,
+    include_total: bool = True,
     current_user_id: int | None = Depends(get_optional_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    if limit is not None:
-        per_page = limit
-
-    validate_pagination(page=page, per_page=per_page)
-
-    if not get_post_by_id(db=db, post_id=post_id):
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Post not found"
-        )
-
-    total, comments = get_post_comments(
+    content = await read_post_comments(
+        request=request,
         db=db,
         post_id=post_id,
         page=page,
-        per_page=per_page,
-    )
-    comment_ids = [comment.id for comment in comments]
-    liked_comment_ids = get_user_liked_comment_ids(
-        db=db,
-        user_id=current_user_id,
-        comment_ids=comment_ids,
+        per_page=limit if limit is not None else per_page,
+        cursor=cursor,
+        include_total=include_total,
+        viewer_id=current_user_id,
     )
 
-    comment_items = [
-        {
-            "id": comment.id,
-            "user_id": comment.user_id,
-            "post_id": comment.post_id,
-            "content": comment.content,
-            "likes": len(comment.likes),
-            "username": comment.user.username,
-            "avatar": comment.user.avatar,
-            "is_liked": comment.id in liked_comment_ids,
-            "created_at": comment.created_at,
-        }
-        for comment in comments
-    ]
-
-    return {
-        "page": page,
-        "per_page": per_page,
-        "total": total,
-        "comments": comment_items,
-        "status": "success",
-        "data": {
-            "page": page,
-            "per_page": per_page,
-            "total": total,
-            "comments": comment_items,
-        },
-    }
+    return json_response(comment_page_envelope(content))
 
 
 @router.post("/{post_id}/like", response_model=MessageResponse)
-def like_post_endpoint(
+async def like_post_endpoint(
     post_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    idempotent: bool = False,
+    current_user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    if not get_post_by_id(db=db, post_id=post_id):
+    try:
+        liked = await like_post(db=db, user_id=current_user_id, post_id=post_id)
+    except IntegrityError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Post not found"
         )
-
-    if get_post_like(db=db, user_id=current_user.id, post_id=post_id):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST, detail="Already liked"
-        )
-
-    try:
-        like_post(db=db, user_id=current_user.id, post_id=post_id)
     except SQLAlchemyError:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Database error",
         )
 
+    if not liked:
+        if not await get_post_by_id(db=db, post_id=post_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Post not found"
+            )
+        if not idempotent:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Already liked"
+            )
+
     return {"message": "Like post successfully"}
 
 
 @router.delete("/{post_id}/like", response_model=MessageResponse)
 @router.delete("/{post_id}/unlike", response_model=MessageResponse)
-def unlike_post_endpoint(
+async def unlike_post_endpoint(
     post_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    idempotent: bool = False,
+    current_user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    if not get_post_by_id(db=db, post_id=post_id):
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Post not found"
-        )
-
-    like = get_post_like(db=db, user_id=current_user.id, post_id=post_id)
-
-    if not like:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="You have not liked this post",
-        )
-
     try:
-        unlike_post(db=db, like=like)
+        unliked = await unlike_post(db=db, user_id=current_user_id, post_id=post_id)
     except SQLAlchemyError:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Database error",
         )
 
+    if not unliked:
+        if not await get_post_by_id(db=db, post_id=post_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Post not found"
+            )
+        if not idempotent:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="You have not liked this post",
+            )
+
     return {"message": "Unlike post successfully"}
 
 
 @router.get("/{post_id}/like", response_model=LikeUsersResponse)
-def get_post_likes_endpoint(
+async def get_post_likes_endpoint(
     post_id: int,
     page: int = 1,
     per_page: int = 10,
-    db: Session = Depends(get_db),
+    cursor: str | None = None,
+    include_total: bool = True,
+    db: AsyncSession = Depends(get_read_db),
 ):
     validate_pagination(page=page, per_page=per_page)
 
-    if not get_post_by_id(db=db, post_id=post_id):
+    if not await get_post_by_id(db=db, post_id=post_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Post not found"
         )
 
-    total, users = get_post_like_users(
-        db=db,
-        post_id=post_id,
-        page=page,
-        per_page=per_page,
-    )
+    try:
+        total, users, next_cursor = await get_post_like_users(
+            db=db,
+            post_id=post_id,
+            page=page,
+            per_page=per_page,
+            cursor=cursor,
+            include_total=include_total,
+        )
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
 
-    return {
-        "page": page,
-        "per_page": per_page,
-        "total": total,
-        "data": [
-            {
-                "id": user.id,
-                "username": user.username,
-                "full_name": user.full_name,
-                "avatar": user.avatar,
-            }
-            for user in users
-        ],
-    }
+    return json_response(
+        {
+            "page": page,
+            "per_page": per_page,
+            "total": total,
+            "next_cursor": next_cursor,
+            "data": [to_user_list_item(user) for user in users],
+        }
+    )
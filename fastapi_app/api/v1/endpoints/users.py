@@ -1,42 +1,71 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session
-
-from fastapi_app.db.session import get_db
-from fastapi_app.dependencies import get_current_user, get_optional_current_user_id
-from fastapi_app.models.post import Post
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Request,
+    Response,
+    status,
+)
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fastapi_app.api.handlers import (
+    read_user_posts,
+    read_user_profile,
+    update_current_user,
+    validate_pagination,
+)
+from fastapi_app.api.v1.envelopes import post_page_envelope, user_envelope
+from fastapi_app.core.etag import (
+    etag_matches,
+    make_etag,
+    not_modified_response,
+    set_etag_headers,
+)
+from fastapi_app.core.pagination import InvalidCursorError
+from fastapi_app.core.responses import json_response
+from fastapi_app.db.session import get_async_db
+from fastapi_app.dependencies import (
+    get_batch_ids,
+    get_current_user,
+    get_current_user_id,
+    get_optional_current_user_id,
+    get_read_db,
+    parse_batch_ids,
+)
 from fastapi_app.models.user import User
 from fastapi_app.schemas.auth import MessageResponse
 from fastapi_app.schemas.post import PostListResponse
 from fastapi_app.schemas.user import (
+    FollowStateResponse,
     FollowStatsResponse,
     IsFollowingResponse,
+    LikeStateResponse,
+    UserBatchResponse,
     UserListResponse,
     UserMeResponse,
     UserPublicResponse,
     UserUpdateRequest,
 )
+from fastapi_app.services.comment_service import get_user_liked_comment_ids
 from fastapi_app.services.follow_service import (
     follow_user,
-    get_follow,
     get_followers,
     get_following,
     get_follow_stats,
+    get_following_ids,
     is_following,
     unfollow_user,
     user_exists,
 )
 from fastapi_app.services.user_service import (
-    get_user_by_id,
-    get_user_conflict_for_update,
-    update_user,
-)
-from fastapi_app.services.post_service import (
-    get_post_comment_counts,
-    get_post_like_counts,
-    get_posts_by_user,
-    get_user_liked_post_ids,
+    get_users_by_ids,
+    to_user_list_item,
+    to_user_profile,
+    to_user_public_profile,
 )
+from fastapi_app.services.post_service import get_user_liked_post_ids
 
 router = APIRouter(
     prefix="/users",
@@ -49,367 +78,359 @@ legacy_router = APIRouter(
 )
 
 
-def validate_pagination(page: int, per_page: int) -> None:
-    if page < 1 or per_page < 1:
+@router.get("", response_model=UserBatchResponse)
+async def get_users_batch(
+    ids: list[int] | None = Depends(get_batch_ids),
+    db: AsyncSession = Depends(get_read_db),
+):
+    if ids is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="page and per_page must be greater than 0",
+            detail="ids is required",
         )
 
+    users = await get_users_by_ids(db=db, user_ids=ids)
 
-def serialize_post(
-    post: Post,
-    likes_count: int,
-    comment_count: int,
-    is_liked: bool,
-) -> dict:
-    return {
-        "id": post.id,
-        "user_id": post.user_id,
-        "content": post.content,
-        "created_at": post.created_at,
-        "username": post.user.username,
-        "avatar": post.user.avatar,
-        "images": [image.image_url for image in post.images],
-        "likes": likes_count,
-        "is_liked": is_liked,
-        "comment_count": comment_count,
-    }
+    return json_response({"users": [to_user_public_profile(user) for user in users]})
 
 
 @router.get("/me", response_model=UserMeResponse)
-def get_me(current_user: User = Depends(get_current_user)):
-    user_data = {
-        "id": current_user.id,
-        "username": current_user.username,
-        "email": current_user.email,
-        "full_name": current_user.full_name,
-        "avatar": current_user.avatar,
-        "desc": current_user.desc,
-    }
-
-    return {**user_data, "status": "success", "data": user_data}
+async def get_me(current_user: User = Depends(get_current_user)):
+    return user_envelope(to_user_profile(current_user))
 
 
-@router.get("/{user_id}", response_model=UserPublicResponse)
-def get_user(user_id: int, db: Session = Depends(get_db)):
-    user = get_user_by_id(db=db, user_id=user_id)
-
-    if not user:
+@router.get("/me/like-state", response_model=LikeStateResponse)
+async def get_like_state(
+    post_ids: str | None = None,
+    comment_ids: str | None = None,
+    current_user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db),
+):
+    if post_ids is None and comment_ids is None:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found",
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="post_ids or comment_ids is required",
         )
 
-    user_data = {
-        "id": user.id,
-        "username": user.username,
-        "full_name": user.full_name,
-        "avatar": user.avatar,
-        "desc": user.desc,
-    }
+    requested_post_ids = (
+        parse_batch_ids(post_ids, name="post_ids") if post_ids is not None else []
+    )
+    requested_comment_ids = (
+        parse_batch_ids(comment_ids, name="comment_ids")
+        if comment_ids is not None
+        else []
+    )
 
-    return {**user_data, "status": "success", "data": user_data}
+    liked_post_ids = await get_user_liked_post_ids(
+        db=db, user_id=current_user_id, post_ids=requested_post_ids
+    )
+    liked_comment_ids = await get_user_liked_comment_ids(
+        db=db, user_id=current_user_id, comment_ids=requested_comment_ids
+    )
 
+    return {
+        "posts": {post_id: post_id in liked_post_ids for post_id in requested_post_ids},
+        "comments": {
+            comment_id: comment_id in liked_comment_ids
+            for comment_id in requested_comment_ids
+        },
+    }
 
-@router.put("/me", response_model=UserMeResponse)
-def update_me(
-    payload: UserUpdateRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-):
-    conflict_user = get_user_conflict_for_update(
-        db=db,
-        user_id=current_user.id,
-        username=payload.username,
-        email=payload.email,
-    )
 
-    if conflict_user:
+@router.get("/me/follow-state", response_model=FollowStateResponse)
+async def get_follow_state(
+    ids: list[int] | None = Depends(get_batch_ids),
+    current_user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db),
+):
+    if ids is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Username or email already exists",
+            detail="ids is required",
         )
 
-    try:
-        updated_user = update_user(
-            db=db,
-            user=current_user,
-            payload=payload,
-        )
-    except SQLAlchemyError:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Database error",
-        )
-
-    user_data = {
-        "id": updated_user.id,
-        "username": updated_user.username,
-        "email": updated_user.email,
-        "full_name": updated_user.full_name,
-        "avatar": updated_user.avatar,
-        "desc": updated_user.desc,
-    }
+    following_ids = await get_following_ids(
+        db=db, follower_id=current_user_id, user_ids=ids
+    )
 
-    return {**user_data, "status": "success", "data": user_data}
+    return {"following": {user_id: user_id in following_ids for user_id in ids}}
 
 
-@router.post("/{user_id}/follow", response_model=MessageResponse)
-def follow(
+@router.get("/{user_id}", response_model=UserPublicResponse)
+async def get_user(
     user_id: int,
+    response: Response,
+    if_none_match: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_read_db),
+):
+    user_data, etag = await read_user_profile(
+        db=db, user_id=user_id, if_none_match=if_none_match
+    )
+
+    if user_data is None:
+        return not_modified_response(etag)
+
+    set_etag_headers(response, etag)
+    return user_envelope(user_data)
+
+
+@router.put("/me", response_model=UserMeResponse)
+async def update_me(
+    payload: UserUpdateRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    if current_user.id == user_id:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="You cannot follow yourself",
-        )
+    updated_user = await update_current_user(db=db, user=current_user, payload=payload)
 
-    if not user_exists(db=db, user_id=user_id):
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found",
-        )
+    return user_envelope(to_user_profile(updated_user))
 
-    existing_follow = get_follow(
-        db=db,
-        follower_id=current_user.id,
-        following_id=user_id,
-    )
 
-    if existing_follow:
+@router.post("/{user_id}/follow", response_model=MessageResponse)
+async def follow(
+    user_id: int,
+    idempotent: bool = False,
+    current_user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db),
+):
+    if current_user_id == user_id:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Already followed",
+            detail="You cannot follow yourself",
         )
 
     try:
-        follow_user(
+        followed = await follow_user(
             db=db,
-            follower_id=current_user.id,
+            follower_id=current_user_id,
             following_id=user_id,
         )
+    except IntegrityError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found",
+        )
     except SQLAlchemyError:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Database error",
         )
 
+    if not followed:
+        if not await user_exists(db=db, user_id=user_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found",
+            )
+        if not idempotent:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Already followed",
+            )
+
     return {"message": "Follow successfully"}
 
 
 @router.delete("/{user_id}/follow", response_model=MessageResponse)
-def unfollow(
+async def unfollow(
     user_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    idempotent: bool = False,
+    current_user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    if current_user.id == user_id:
+    if current_user_id == user_id:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="You cannot unfollow yourself",
         )
 
-    if not user_exists(db=db, user_id=user_id):
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found",
-        )
-
-    follow = get_follow(
-        db=db,
-        follower_id=current_user.id,
-        following_id=user_id,
-    )
-
-    if not follow:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="You are not following this user",
-        )
-
     try:
-        unfollow_user(db=db, follow=follow)
+        unfollowed = await unfollow_user(
+            db=db,
+            follower_id=current_user_id,
+            following_id=user_id,
+        )
     except SQLAlchemyError:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Database error",
         )
 
+    if not unfollowed:
+        if not await user_exists(db=db, user_id=user_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found",
+            )
+        if not idempotent:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="You are not following this user",
+            )
+
     return {"message": "Unfollow successfully"}
 
 
 @router.get("/{user_id}/follow-stats", response_model=FollowStatsResponse)
-def follow_stats(user_id: int, db: Session = Depends(get_db)):
-    if not user_exists(db=db, user_id=user_id):
+async def follow_stats(
+    user_id: int,
+    response: Response,
+    if_none_match: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_read_db),
+):
+    stats = await get_follow_stats(db=db, user_id=user_id)
+
+    if stats is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
 
-    return get_follow_stats(db=db, user_id=user_id)
+    etag = make_etag(
+        "follow-stats", user_id, stats["followers_count"], stats["following_count"]
+    )
+    if etag_matches(if_none_match, etag):
+        return not_modified_response(etag)
+
+    set_etag_headers(response, etag)
+    return stats
 
 
 @router.get("/{user_id}/followers", response_model=UserListResponse)
-def get_followers_list(
+async def get_followers_list(
     user_id: int,
     page: int = 1,
     per_page: int = 10,
-    db: Session = Depends(get_db),
+    cursor: str | None = None,
+    include_total: bool = True,
+    db: AsyncSession = Depends(get_read_db),
 ):
     validate_pagination(page=page, per_page=per_page)
 
-    if not user_exists(db=db, user_id=user_id):
+    if not await user_exists(db=db, user_id=user_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
 
-    total, users = get_followers(
-        db=db,
-        user_id=user_id,
-        page=page,
-        per_page=per_page,
-    )
+    try:
+        total, users, next_cursor = await get_followers(
+            db=db,
+            user_id=user_id,
+            page=page,
+            per_page=per_page,
+            cursor=cursor,
+            include_total=include_total,
+        )
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
 
-    return {
-        "page": page,
-        "per_page": per_page,
-        "total": total,
-        "data": [
-            {
-                "id": user.id,
-                "username": user.username,
-                "full_name": user.full_name,
-                "avatar": user.avatar,
-            }
-            for user in users
-        ],
-    }
+    return json_response(
+        {
+            "page": page,
+            "per_page": per_page,
+            "total": total,
+            "next_cursor": next_cursor,
+            "data": [to_user_list_item(user) for user in users],
+            "status": None,
+        }
+    )
 
 
 @router.get("/{user_id}/following", response_model=UserListResponse)
-def get_following_list(
+async def get_following_list(
     user_id: int,
     page: int = 1,
     per_page: int = 10,
-    db: Session = Depends(get_db),
+    cursor: str | None = None,
+    include_total: bool = True,
+    db: AsyncSession = Depends(get_read_db),
 ):
     validate_pagination(page=page, per_page=per_page)
 
-    if not user_exists(db=db, user_id=user_id):
+    if not await user_exists(db=db, user_id=user_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
 
-    total, users = get_following(
-        db=db,
-        user_id=user_id,
-        page=page,
-        per_page=per_page,
-    )
+    try:
+        total, users, next_cursor = await get_following(
+            db=db,
+            user_id=user_id,
+            page=page,
+            per_page=per_page,
+            cursor=cursor,
+            include_total=include_total,
+        )
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
 
-    return {
-        "page": page,
-        "per_page": per_page,
-        "total": total,
-        "data": [
-            {
-                "id": user.id,
-                "username": user.username,
-                "full_name": user.full_name,
-                "avatar": user.avatar,
-            }
-            for user in users
-        ],
-    }
+    return json_response(
+        {
+            "page": page,
+            "per_page": per_page,
+            "total": total,
+            "next_cursor": next_cursor,
+            "data": [to_user_list_item(user) for user in users],
+            "status": None,
+        }
+    )
 
 
 @router.get("/{user_id}/is-following", response_model=IsFollowingResponse)
-def get_is_following(
+async def get_is_following(
     user_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    if current_user.id == user_id:
+    if current_user_id == user_id:
         return {"is_following": False}
 
-    if not user_exists(db=db, user_id=user_id):
+    if not await user_exists(db=db, user_id=user_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
 
     return {
-        "is_following": is_following(
+        "is_following": await is_following(
             db=db,
-            follower_id=current_user.id,
+            follower_id=current_user_id,
             following_id=user_id,
         )
     }
 
 
 @router.get("/{user_id}/posts", response_model=PostListResponse)
-def get_user_posts(
+async def get_user_posts(
     user_id: int,
+    request: Request,
     page: int = 1,
     per_page: int = 10,
     limit: int | None = None,
+    cursor: str | None = None,
+    include_total: bool = True,
     current_user_id: int | None = Depends(get_optional_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    if limit is not None:
-        per_page = limit
-
-    validate_pagination(page=page, per_page=per_page)
-
-    if not user_exists(db=db, user_id=user_id):
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found",
-        )
-
-    total, posts = get_posts_by_user(
+    content = await read_user_posts(
+        request=request,
         db=db,
         user_id=user_id,
         page=page,
-        per_page=per_page,
+        per_page=limit if limit is not None else per_page,
+        cursor=cursor,
+        include_total=include_total,
+        viewer_id=current_user_id,
     )
-    post_ids = [post.id for post in posts]
-    likes_counts = get_post_like_counts(db=db, post_ids=post_ids)
-    comment_counts = get_post_comment_counts(db=db, post_ids=post_ids)
-    liked_post_ids = get_user_liked_post_ids(
-        db=db,
-        user_id=current_user_id,
-        post_ids=post_ids,
-    )
-
-    post_items = [
-        serialize_post(
-            post=post,
-            likes_count=likes_counts.get(post.id, 0),
-            comment_count=comment_counts.get(post.id, 0),
-            is_liked=post.id in liked_post_ids,
-        )
-        for post in posts
-    ]
 
-    return {
-        "page": page,
-        "per_page": per_page,
-        "total": total,
-        "posts": post_items,
-        "status": "success",
-        "data": {
-            "page": page,
-            "per_page": per_page,
-            "total_post": total,
-            "posts": post_items,
-        },
-    }
+    return json_response(post_page_envelope(content))
 
 
 legacy_router.add_api_route(
@@ -0,0 +1,24 @@
+def post_page_envelope(content: dict) -> dict:
+    return {
+        **content,
+        "status": "success",
+        "data": {
+            "page": content["page"],
+            "per_page": content["per_page"],
+            "total_post": content["total"],
+            "next_cursor": content["next_cursor"],
+            "posts": content["posts"],
+        },
+    }
+
+
+def comment_page_envelope(content: dict) -> dict:
+    return {**content, "status": "success", "data": content}
+
+
+def post_envelope(post_item: dict) -> dict:
+    return {"post": post_item, "status": "success", "data": {"post": post_item}}
+
+
+def user_envelope(user_data: dict) -> dict:
+    return {**user_data, "status": "success", "data": user_data}
@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from fastapi_app.api.v1.endpoints import auth, comments, posts, users
+from fastapi_app.api.v1.endpoints import auth, comments, feed, metrics, posts, users
 
 api_router = APIRouter()
 api_router.include_router(auth.router)
@@ -8,3 +8,5 @@ api_router.include_router(users.router)
 api_router.include_router(users.legacy_router)
 api_router.include_router(posts.router)
 api_router.include_router(comments.router)
+api_router.include_router(feed.router)
+api_router.include_router(metrics.router)
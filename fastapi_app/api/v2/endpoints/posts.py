@@ -0,0 +1,141 @@
+from fastapi import APIRouter, Depends, Header, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fastapi_app.api.handlers import read_post_comments, read_post_detail, read_posts
+from fastapi_app.api.v1.endpoints import posts as v1_posts
+from fastapi_app.core.etag import not_modified_response, set_etag_headers
+from fastapi_app.core.responses import json_response
+from fastapi_app.dependencies import (
+    get_batch_ids,
+    get_optional_current_user_id,
+    get_read_db,
+)
+from fastapi_app.schemas.auth import MessageResponse
+from fastapi_app.schemas.comment import CommentPageResponse
+from fastapi_app.schemas.post import (
+    LikeUsersResponse,
+    PostBatchResponse,
+    PostCreatedResponse,
+    PostItemResponse,
+    PostPageResponse,
+)
+
+router = APIRouter(
+    prefix="/posts",
+    tags=["posts"],
+)
+
+
+@router.get("", response_model=PostPageResponse | PostBatchResponse)
+async def get_posts_endpoint(
+    request: Request,
+    page: int = 1,
+    per_page: int = 10,
+    cursor: str | None = None,
+    include_total: bool = True,
+    approximate_total: bool = False,
+    ids: list[int] | None = Depends(get_batch_ids),
+    current_user_id: int | None = Depends(get_optional_current_user_id),
+    db: AsyncSession = Depends(get_read_db),
+):
+    content = await read_posts(
+        request=request,
+        db=db,
+        page=page,
+        per_page=per_page,
+        cursor=cursor,
+        include_total=include_total,
+        approximate_total=approximate_total,
+        ids=ids,
+        viewer_id=current_user_id,
+    )
+
+    return json_response(content)
+
+
+@router.get("/{post_id}", response_model=PostItemResponse)
+async def get_post_detail_endpoint(
+    post_id: int,
+    request: Request,
+    response: Response,
+    if_none_match: str | None = Header(default=None),
+    current_user_id: int | None = Depends(get_optional_current_user_id),
+    db: AsyncSession = Depends(get_read_db),
+):
+    post_item, etag = await read_post_detail(
+        request=request,
+        db=db,
+        post_id=post_id,
+        if_none_match=if_none_match,
+        viewer_id=current_user_id,
+    )
+
+    if post_item is None:
+        return not_modified_response(etag)
+
+    set_etag_headers(response, etag)
+    return json_response(post_item, response=response)
+
+
+@router.get("/{post_id}/comments", response_model=CommentPageResponse)
+async def get_post_comments_endpoint(
+    post_id: int,
+    request: Request,
+    page: int = 1,
+    per_page: int = 10,
+    cursor: str | None = None,
+    include_total: bool = True,
+    current_user_id: int | None = Depends(get_optional_current_user_id),
+    db: AsyncSession = Depends(get_read_db),
+):
+    content = await read_post_comments(
+        request=request,
+        db=db,
+        post_id=post_id,
+        page=page,
+        per_page=per_page,
+        cursor=cursor,
+        include_total=include_total,
+        viewer_id=current_user_id,
+    )
+
+    return json_response(content)
+
+
+router.add_api_route(
+    "",
+    v1_posts.create_post_endpoint,
+    methods=["POST"],
+    response_model=PostCreatedResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+router.add_api_route(
+    "/{post_id}",
+    v1_posts.update_post_endpoint,
+    methods=["PUT"],
+    response_model=MessageResponse,
+)
+router.add_api_route(
+    "/{post_id}",
+    v1_posts.delete_post_endpoint,
+    methods=["DELETE"],
+    response_model=MessageResponse,
+)
+router.add_api_route(
+    "/{post_id}/like",
+    v1_posts.like_post_endpoint,
+    methods=["POST"],
+    response_model=MessageResponse,
+)
+router.add_api_route(
+    "/{post_id}/like",
+    v1_posts.unlike_post_endpoint,
+    methods=["DELETE"],
+    response_model=MessageResponse,
+)
+router.add_api_route(
+    "/{post_id}/like",
+    v1_posts.get_post_likes_endpoint,
+    methods=["GET"],
+    response_model=LikeUsersResponse,
+)
@@ -0,0 +1,152 @@
+from fastapi import APIRouter, Depends, Header, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fastapi_app.api.handlers import (
+    read_user_posts,
+    read_user_profile,
+    update_current_user,
+)
+from fastapi_app.api.v1.endpoints import users as v1_users
+from fastapi_app.core.etag import not_modified_response, set_etag_headers
+from fastapi_app.core.responses import json_response
+from fastapi_app.db.session import get_async_db
+from fastapi_app.dependencies import (
+    get_current_user,
+    get_optional_current_user_id,
+    get_read_db,
+)
+from fastapi_app.models.user import User
+from fastapi_app.schemas.auth import MessageResponse
+from fastapi_app.schemas.post import PostPageResponse
+from fastapi_app.schemas.user import (
+    FollowStateResponse,
+    FollowStatsResponse,
+    IsFollowingResponse,
+    LikeStateResponse,
+    UserBatchResponse,
+    UserListResponse,
+    UserProfileResponse,
+    UserPublicProfileResponse,
+    UserUpdateRequest,
+)
+from fastapi_app.services.user_service import to_user_profile
+
+router = APIRouter(
+    prefix="/users",
+    tags=["users"],
+)
+
+
+@router.get("/me", response_model=UserProfileResponse)
+async def get_me(current_user: User = Depends(get_current_user)):
+    return to_user_profile(current_user)
+
+
+@router.put("/me", response_model=UserProfileResponse)
+async def update_me(
+    payload: UserUpdateRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    updated_user = await update_current_user(db=db, user=current_user, payload=payload)
+
+    return to_user_profile(updated_user)
+
+
+@router.get("/{user_id}", response_model=UserPublicProfileResponse)
+async def get_user(
+    user_id: int,
+    response: Response,
+    if_none_match: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_read_db),
+):
+    user_data, etag = await read_user_profile(
+        db=db, user_id=user_id, if_none_match=if_none_match
+    )
+
+    if user_data is None:
+        return not_modified_response(etag)
+
+    set_etag_headers(response, etag)
+    return user_data
+
+
+@router.get("/{user_id}/posts", response_model=PostPageResponse)
+async def get_user_posts(
+    user_id: int,
+    request: Request,
+    page: int = 1,
+    per_page: int = 10,
+    cursor: str | None = None,
+    include_total: bool = True,
+    current_user_id: int | None = Depends(get_optional_current_user_id),
+    db: AsyncSession = Depends(get_read_db),
+):
+    content = await read_user_posts(
+        request=request,
+        db=db,
+        user_id=user_id,
+        page=page,
+        per_page=per_page,
+        cursor=cursor,
+        include_total=include_total,
+        viewer_id=current_user_id,
+    )
+
+    return json_response(content)
+
+
+router.add_api_route(
+    "",
+    v1_users.get_users_batch,
+    methods=["GET"],
+    response_model=UserBatchResponse,
+)
+router.add_api_route(
+    "/me/like-state",
+    v1_users.get_like_state,
+    methods=["GET"],
+    response_model=LikeStateResponse,
+)
+router.add_api_route(
+    "/me/follow-state",
+    v1_users.get_follow_state,
+    methods=["GET"],
+    response_model=FollowStateResponse,
+)
+router.add_api_route(
+    "/{user_id}/follow",
+    v1_users.follow,
+    methods=["POST"],
+    response_model=MessageResponse,
+)
+router.add_api_route(
+    "/{user_id}/follow",
+    v1_users.unfollow,
+    methods=["DELETE"],
+    response_model=MessageResponse,
+)
+router.add_api_route(
+    "/{user_id}/follow-stats",
+    v1_users.follow_stats,
+    methods=["GET"],
+    response_model=FollowStatsResponse,
+)
+router.add_api_route(
+    "/{user_id}/followers",
+    v1_users.get_followers_list,
+    methods=["GET"],
+    response_model=UserListResponse,
+)
+router.add_api_route(
+    "/{user_id}/following",
+    v1_users.get_following_list,
+    methods=["GET"],
+    response_model=UserListResponse,
+)
+router.add_api_route(
+    "/{user_id}/is-following",
+    v1_users.get_is_following,
+    methods=["GET"],
+    response_model=IsFollowingResponse,
+)
@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+
+from fastapi_app.api.v1.endpoints import auth, comments
+from fastapi_app.api.v2.endpoints import feed, posts, users
+
+api_router = APIRouter()
+api_router.include_router(auth.router)
+api_router.include_router(users.router)
+api_router.include_router(posts.router)
+api_router.include_router(comments.router)
+api_router.include_router(feed.router)
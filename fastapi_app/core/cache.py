@@ -0,0 +1,230 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any
+
+import orjson
+
+from fastapi_app.core.config import settings
+
+
+def is_counter(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def dump_value(value: Any) -> bytes:
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+
+def load_value(raw: bytes | None) -> Any:
+    if raw is None:
+        return None
+    return orjson.loads(raw)
+
+
+class CacheBackend(ABC):
+    async def get(self, key: str) -> Any:
+        return (await self.get_many([key]))[0]
+
+    @abstractmethod
+    async def get_many(self, keys: list[str]) -> list[Any]: ...
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: int | None = None) -> None: ...
+
+    @abstractmethod
+    async def delete_many(self, keys: list[str]) -> None: ...
+
+    @abstractmethod
+    async def incr(self, key: str, amount: int = 1, ttl: int | None = None) -> int: ...
+
+    def pipeline(self) -> "CachePipeline":
+        return CachePipeline(self)
+
+
+class CachePipeline:
+    def __init__(self, backend: CacheBackend) -> None:
+        self.backend = backend
+        self.operations: list[tuple[str, tuple]] = []
+
+    def get(self, key: str) -> "CachePipeline":
+        self.operations.append(("get", (key,)))
+        return self
+
+    def set(self, key: str, value: Any, ttl: int | None = None) -> "CachePipeline":
+        self.operations.append(("set", (key, value, ttl)))
+        return self
+
+    def delete_many(self, keys: list[str]) -> "CachePipeline":
+        self.operations.append(("delete_many", (keys,)))
+        return self
+
+    def incr(
+        self, key: str, amount: int = 1, ttl: int | None = None
+    ) -> "CachePipeline":
+        self.operations.append(("incr", (key, amount, ttl)))
+        return self
+
+    async def execute(self) -> list[Any]:
+        return [
+            await getattr(self.backend, name)(*args) for name, args in self.operations
+        ]
+
+
+class LocalCacheBackend(CacheBackend):
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float | None, Any]] = OrderedDict()
+        self._counters: dict[str, tuple[float | None, int]] = {}
+
+    def _get(self, key: str) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return self._get_counter(key)
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _get_counter(self, key: str) -> int | None:
+        counter = self._counters.get(key)
+        if counter is None:
+            return None
+        expires_at, value = counter
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._counters[key]
+            return None
+        return value
+
+    def _set(self, key: str, value: Any, ttl: int | None) -> None:
+        expires_at = time.monotonic() + ttl if ttl else None
+        if is_counter(value):
+            self._entries.pop(key, None)
+            self._set_counter(key, value, expires_at)
+            return
+
+        self._counters.pop(key, None)
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def _set_counter(self, key: str, value: int, expires_at: float | None) -> None:
+        self._counters[key] = (expires_at, value)
+        if len(self._counters) > self.max_size:
+            now = time.monotonic()
+            self._counters = {
+                key: counter
+                for key, counter in self._counters.items()
+                if counter[0] is None or counter[0] > now
+            }
+
+    async def get_many(self, keys: list[str]) -> list[Any]:
+        with self._lock:
+            return [self._get(key) for key in keys]
+
+    async def set(self, key: str, value: Any, ttl: int | None = None) -> None:
+        with self._lock:
+            self._set(key, value, ttl)
+
+    async def delete_many(self, keys: list[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+                self._counters.pop(key, None)
+
+    async def incr(self, key: str, amount: int = 1, ttl: int | None = None) -> int:
+        with self._lock:
+            value = (self._get_counter(key) or 0) + amount
+            if ttl is None and key in self._counters:
+                self._counters[key] = (self._counters[key][0], value)
+            else:
+                self._set(key, value, ttl)
+            return value
+
+
+class RedisCachePipeline(CachePipeline):
+    async def execute(self) -> list[Any]:
+        pipe = self.backend.client.pipeline(transaction=False)
+        queued = [
+            getattr(self.backend, f"_queue_{name}")(pipe, *args)
+            for name, args in self.operations
+        ]
+        results = await pipe.execute()
+
+        values = []
+        position = 0
+        for (name, _), count in zip(self.operations, queued):
+            if name == "get":
+                values.append(load_value(results[position]))
+            elif name == "incr":
+                values.append(results[position])
+            else:
+                values.append(None)
+            position += count
+        return values
+
+
+class RedisCacheBackend(CacheBackend):
+    def __init__(self, client, prefix: str = "") -> None:
+        self.client = client
+        self.prefix = prefix
+
+    def _queue_get(self, pipe, key: str) -> int:
+        pipe.get(self.prefix + key)
+        return 1
+
+    def _queue_set(self, pipe, key: str, value: Any, ttl: int | None) -> int:
+        pipe.set(self.prefix + key, dump_value(value), ex=ttl)
+        return 1
+
+    def _queue_delete_many(self, pipe, keys: list[str]) -> int:
+        if not keys:
+            return 0
+        pipe.delete(*[self.prefix + key for key in keys])
+        return 1
+
+    def _queue_incr(self, pipe, key: str, amount: int, ttl: int | None) -> int:
+        pipe.incrby(self.prefix + key, amount)
+        if not ttl:
+            return 1
+        pipe.expire(self.prefix + key, ttl)
+        return 2
+
+    async def get_many(self, keys: list[str]) -> list[Any]:
+        if not keys:
+            return []
+        raws = await self.client.mget([self.prefix + key for key in keys])
+        return [load_value(raw) for raw in raws]
+
+    async def set(self, key: str, value: Any, ttl: int | None = None) -> None:
+        await self.client.set(self.prefix + key, dump_value(value), ex=ttl)
+
+    async def delete_many(self, keys: list[str]) -> None:
+        if keys:
+            await self.client.delete(*[self.prefix + key for key in keys])
+
+    async def incr(self, key: str, amount: int = 1, ttl: int | None = None) -> int:
+        return (await self.pipeline().incr(key, amount, ttl).execute())[0]
+
+    def pipeline(self) -> RedisCachePipeline:
+        return RedisCachePipeline(self)
+
+
+def create_cache_backend(url: str, client=None) -> CacheBackend:
+    if client is None and not url.startswith(("redis://", "rediss://", "unix://")):
+        return LocalCacheBackend(max_size=settings.cache_max_entries)
+
+    if client is None:
+        import redis.asyncio as redis
+
+        client = redis.from_url(url)
+
+    return RedisCacheBackend(client=client, prefix=settings.cache_key_prefix)
+
+
+cache = create_cache_backend(settings.cache_url)
@@ -0,0 +1,215 @@
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from fastapi_app.core.config import settings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/problem+json",
+    "image/svg+xml",
+)
+
+
+class GzipEncoder:
+    def __init__(self, level: int) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+class BrotliEncoder:
+    def __init__(self, quality: int) -> None:
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.process(data) + self._compressor.finish()
+
+
+class ZstdEncoder:
+    def __init__(self, level: int) -> None:
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+def get_available_encoders() -> dict:
+    encoders = {}
+    if brotli is not None:
+        encoders["br"] = lambda: BrotliEncoder(settings.brotli_quality)
+    if zstandard is not None:
+        encoders["zstd"] = lambda: ZstdEncoder(settings.zstd_level)
+    encoders["gzip"] = lambda: GzipEncoder(settings.gzip_level)
+    return encoders
+
+
+def choose_encoding(accept_encoding: str, available: list[str]) -> str | None:
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        weights[name] = quality
+
+    best = None
+    best_quality = 0.0
+    for name in available:
+        quality = weights.get(name, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = name, quality
+    return best
+
+
+def is_compressible(headers: Headers) -> bool:
+    if "content-encoding" in headers:
+        return False
+    if "no-transform" in headers.get("cache-control", "").lower():
+        return False
+    content_type = headers.get("content-type", "").lower()
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def add_vary(headers: MutableHeaders, value: str) -> None:
+    vary = headers.get("vary")
+    if not vary:
+        headers["vary"] = value
+    elif value.lower() not in {item.strip().lower() for item in vary.split(",")}:
+        headers["vary"] = f"{vary}, {value}"
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.encoders = get_available_encoders()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] == "HEAD"
+            or not settings.compression_enabled
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        encoding = choose_encoding(accept_encoding, list(self.encoders))
+        responder = CompressionResponder(
+            self.app, encoding, self.encoders.get(encoding)
+        )
+        await responder(scope, receive, send)
+
+
+class CompressionResponder:
+    def __init__(self, app: ASGIApp, encoding: str | None, make_encoder) -> None:
+        self.app = app
+        self.encoding = encoding
+        self.make_encoder = make_encoder
+        self.send: Send | None = None
+        self.start_message: Message | None = None
+        self.encoder = None
+        self.passthrough = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_with_compression)
+
+    async def send_with_compression(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            status_code = message["status"]
+            if (
+                status_code < 200
+                or status_code in (204, 304)
+                or not is_compressible(headers)
+            ):
+                self.passthrough = True
+                await self.send(message)
+                return
+
+            if self.encoding is None:
+                self.passthrough = True
+                add_vary(MutableHeaders(scope=message), "Accept-Encoding")
+                await self.send(message)
+                return
+
+            self.start_message = message
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.encoder is None:
+            headers = MutableHeaders(scope=self.start_message)
+            add_vary(headers, "Accept-Encoding")
+
+            if not more_body and len(body) < settings.compression_min_size:
+                self.passthrough = True
+                await self.send(self.start_message)
+                await self.send(message)
+                return
+
+            self.encoder = self.make_encoder()
+            headers["Content-Encoding"] = self.encoding
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = f"W/{etag}"
+
+            if not more_body:
+                body = self.encoder.finish(body)
+                headers["Content-Length"] = str(len(body))
+                await self.send(self.start_message)
+                await self.send({"type": "http.response.body", "body": body})
+                return
+
+            del headers["Content-Length"]
+            await self.send(self.start_message)
+
+        if more_body:
+            body = self.encoder.compress(body)
+        else:
+            body = self.encoder.finish(body)
+        await self.send(
+            {"type": "http.response.body", "body": body, "more_body": more_body}
+        )
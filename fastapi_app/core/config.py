@@ -1,5 +1,66 @@
+import os
+
+from dotenv import load_dotenv
 from pydantic import BaseModel
 
+load_dotenv()
+
 
 class Settings(BaseModel):
     app_name: str = "Social API"
+    timeline_backfill_limit: int = int(os.getenv("TIMELINE_BACKFILL_LIMIT", "20"))
+    timeline_fanout_threshold: int = int(
+        os.getenv("TIMELINE_FANOUT_THRESHOLD", "10000")
+    )
+    timeline_recent_posts_limit: int = int(
+        os.getenv("TIMELINE_RECENT_POSTS_LIMIT", "50")
+    )
+    timeline_pull_cache_ttl: int = int(os.getenv("TIMELINE_PULL_CACHE_TTL", "60"))
+    post_count_cache_ttl: int = int(os.getenv("POST_COUNT_CACHE_TTL", "30"))
+    db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    db_pool_timeout: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    db_pool_recycle: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    db_pool_pre_ping: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    database_replica_urls: list[str] = [
+        url.strip()
+        for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",")
+        if url.strip()
+    ]
+    replica_pin_seconds: int = int(os.getenv("REPLICA_PIN_SECONDS", "5"))
+    replica_retry_seconds: int = int(os.getenv("REPLICA_RETRY_SECONDS", "30"))
+    cache_url: str = os.getenv("CACHE_URL", "")
+    cache_key_prefix: str = os.getenv("CACHE_KEY_PREFIX", "social:")
+    cache_max_entries: int = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+    metrics_token: str = os.getenv("METRICS_TOKEN", "")
+    token_cache_size: int = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+    bcrypt_rounds: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    password_hash_workers: int = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+    password_hash_queue_limit: int = int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", "16"))
+    like_counter_flush_interval: float = float(
+        os.getenv("LIKE_COUNTER_FLUSH_INTERVAL", "0")
+    )
+    like_counter_flush_batch_size: int = int(
+        os.getenv("LIKE_COUNTER_FLUSH_BATCH_SIZE", "1000")
+    )
+    counter_compaction_interval: float = float(
+        os.getenv("COUNTER_COMPACTION_INTERVAL", "0")
+    )
+    counter_compaction_batch_size: int = int(
+        os.getenv("COUNTER_COMPACTION_BATCH_SIZE", "1000")
+    )
+    batch_max_ids: int = int(os.getenv("BATCH_MAX_IDS", "100"))
+    response_cache_ttl: int = int(os.getenv("RESPONSE_CACHE_TTL", "10"))
+    fast_json_responses: bool = (
+        os.getenv("FAST_JSON_RESPONSES", "true").lower() == "true"
+    )
+    compression_enabled: bool = (
+        os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+    )
+    compression_min_size: int = int(os.getenv("COMPRESSION_MIN_SIZE", "500"))
+    gzip_level: int = int(os.getenv("GZIP_LEVEL", "6"))
+    brotli_quality: int = int(os.getenv("BROTLI_QUALITY", "4"))
+    zstd_level: int = int(os.getenv("ZSTD_LEVEL", "3"))
+
+
+settings = Settings()
@@ -0,0 +1,27 @@
+import hashlib
+
+from fastapi import Response, status
+
+
+def make_etag(*parts) -> str:
+    digest = hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+
+
+def set_etag_headers(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Vary"] = "Authorization"
+
+
+def not_modified_response(etag: str) -> Response:
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_etag_headers(response, etag)
+    return response
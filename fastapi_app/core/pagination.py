@@ -0,0 +1,83 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from sqlalchemy import Select, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(*values: datetime | int) -> str:
+    raw = json.dumps(
+        [
+            value.isoformat() if isinstance(value, datetime) else value
+            for value in values
+        ],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_values(cursor: str) -> list:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError):
+        raise InvalidCursorError("Invalid cursor")
+    if not isinstance(values, list):
+        raise InvalidCursorError("Invalid cursor")
+    return values
+
+
+def decode_id_cursor(cursor: str) -> int:
+    values = _decode_values(cursor)
+    if len(values) != 1 or type(values[0]) is not int:
+        raise InvalidCursorError("Invalid cursor")
+    return values[0]
+
+
+def decode_time_cursor(cursor: str) -> tuple[datetime, int]:
+    values = _decode_values(cursor)
+    if len(values) != 2 or type(values[1]) is not int:
+        raise InvalidCursorError("Invalid cursor")
+    try:
+        created_at = datetime.fromisoformat(values[0])
+    except (TypeError, ValueError):
+        raise InvalidCursorError("Invalid cursor")
+    return created_at, values[1]
+
+
+def paginate_by_time(
+    stmt: Select,
+    created_at_column,
+    id_column,
+    page: int,
+    per_page: int,
+    cursor: str | None,
+) -> Select:
+    stmt = stmt.order_by(created_at_column.desc(), id_column.desc()).limit(per_page)
+
+    if cursor is None:
+        return stmt.offset((page - 1) * per_page)
+
+    created_at, last_id = decode_time_cursor(cursor)
+    return stmt.where(tuple_(created_at_column, id_column) < (created_at, last_id))
+
+
+def paginate_by_id(
+    stmt: Select, id_column, page: int, per_page: int, cursor: str | None
+) -> Select:
+    stmt = stmt.order_by(id_column.desc()).limit(per_page)
+
+    if cursor is None:
+        return stmt.offset((page - 1) * per_page)
+
+    return stmt.where(id_column < decode_id_cursor(cursor))
+
+
+async def count_rows(db: AsyncSession, stmt: Select) -> int:
+    return await db.scalar(select(func.count()).select_from(stmt.subquery()))
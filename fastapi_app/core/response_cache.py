@@ -0,0 +1,140 @@
+import threading
+from dataclasses import dataclass, field
+
+from fastapi import Request
+
+from fastapi_app.core.cache import CacheBackend, cache
+from fastapi_app.core.config import settings
+
+TAG_SEQUENCE_KEY = "tag-sequence"
+
+
+@dataclass
+class CachedResponse:
+    content: dict
+    tag_versions: dict[str, int]
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+class ResponseCache:
+    def __init__(self, backend: CacheBackend, ttl: int) -> None:
+        self.backend = backend
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _record(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    async def get(self, key: str | None) -> tuple[CachedResponse | None, int]:
+        if key is None or self.ttl <= 0:
+            return None, 0
+
+        values, sequence = await self.backend.get_many(
+            [f"response:{key}", TAG_SEQUENCE_KEY]
+        )
+        token = sequence or 0
+        if values is None:
+            self._record(hit=False)
+            return None, token
+        entry = CachedResponse(**values)
+
+        tags = list(entry.tag_versions)
+        versions = await self.backend.get_many([f"tag:{tag}" for tag in tags])
+        if any(
+            (version or 0) != entry.tag_versions[tag]
+            for tag, version in zip(tags, versions)
+        ):
+            self._record(hit=False)
+            return None, token
+
+        self._record(hit=True)
+        return entry, token
+
+    async def set(
+        self,
+        key: str | None,
+        content: dict,
+        tags: set[str],
+        token: int,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        if key is None or self.ttl <= 0:
+            return
+
+        tags = sorted(tags)
+        pipe = self.backend.pipeline()
+        for tag in tags:
+            pipe.incr(f"tag:{tag}", 0, ttl=self.ttl * 2)
+        versions = await pipe.execute()
+        if any(version > token for version in versions):
+            return
+
+        await self.backend.set(
+            f"response:{key}",
+            {
+                "content": content,
+                "tag_versions": dict(zip(tags, versions)),
+                "headers": headers or {},
+            },
+            ttl=self.ttl,
+        )
+
+    async def invalidate(self, *tags: str) -> None:
+        if self.ttl <= 0:
+            return
+
+        sequence = await self.backend.incr(TAG_SEQUENCE_KEY)
+        pipe = self.backend.pipeline()
+        for tag in tags:
+            pipe.set(f"tag:{tag}", sequence, ttl=self.ttl * 2)
+        await pipe.execute()
+
+        with self._lock:
+            self.invalidations += len(tags)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": type(self.backend).__name__,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "invalidations": self.invalidations,
+            }
+
+
+response_cache = ResponseCache(backend=cache, ttl=settings.response_cache_ttl)
+
+
+def get_cache_key(request: Request, viewer_id: int | None) -> str | None:
+    if viewer_id is not None:
+        return None
+    query = "&".join(
+        f"{name}={value}" for name, value in sorted(request.query_params.multi_items())
+    )
+    return f"{request.url.path}?{query}"
+
+
+def get_post_tags(post_items: list[dict]) -> set[str]:
+    tags = set()
+    for item in post_items:
+        tags.add(f"post:{item['id']}")
+        tags.add(f"user:{item['user_id']}")
+    return tags
+
+
+def get_comment_tags(comment_items: list[dict]) -> set[str]:
+    tags = set()
+    for item in comment_items:
+        tags.add(f"comment:{item['id']}")
+        tags.add(f"user:{item['user_id']}")
+    return tags
@@ -0,0 +1,13 @@
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
+
+from fastapi_app.core.config import settings
+
+
+def json_response(
+    content: dict, response: Response | None = None
+) -> ORJSONResponse | dict:
+    if not settings.fast_json_responses:
+        return content
+    headers = dict(response.headers) if response is not None else None
+    return ORJSONResponse(content, headers=headers)
@@ -1,9 +1,15 @@
+import hashlib
 import os
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 
 import jwt
 from dotenv import load_dotenv
 
+from fastapi_app.core.config import settings
+
 load_dotenv()
 
 JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
@@ -12,6 +18,54 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 5
 REFRESH_TOKEN_EXPIRE_DAYS = 30
 
 
+class VerifiedTokenCache:
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._claims: OrderedDict[bytes, dict] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.decode_seconds = 0.0
+
+    def get(self, token_digest: bytes) -> dict | None:
+        with self._lock:
+            claims = self._claims.get(token_digest)
+            if claims is None or claims["exp"] <= time.time():
+                self._claims.pop(token_digest, None)
+                self.misses += 1
+                return None
+            self._claims.move_to_end(token_digest)
+            self.hits += 1
+            return dict(claims)
+
+    def set(self, token_digest: bytes, claims: dict, decode_seconds: float) -> None:
+        with self._lock:
+            self.decode_seconds += decode_seconds
+            if not isinstance(claims.get("exp"), (int, float)):
+                return
+            self._claims[token_digest] = dict(claims)
+            self._claims.move_to_end(token_digest)
+            while len(self._claims) > self.max_size:
+                self._claims.popitem(last=False)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            average_decode = self.decode_seconds / self.misses if self.misses else 0.0
+            return {
+                "size": len(self._claims),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "average_decode_ms": round(average_decode * 1000, 3),
+                "estimated_saved_ms": round(average_decode * self.hits * 1000, 3),
+            }
+
+
+verified_token_cache = VerifiedTokenCache(max_size=settings.token_cache_size)
+
+
 def create_token(user_id: int, token_type: str, expires_delta: timedelta) -> str:
     now = datetime.now(timezone.utc)
 
@@ -42,4 +96,14 @@ def create_refresh_token(user_id: int) -> str:
 
 
 def decode_token(token: str) -> dict:
-    return jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+    token_digest = hashlib.sha256(token.encode()).digest()
+    claims = verified_token_cache.get(token_digest)
+    if claims is not None:
+        return claims
+
+    started = time.perf_counter()
+    claims = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+    verified_token_cache.set(
+        token_digest, claims, decode_seconds=time.perf_counter() - started
+    )
+    return claims
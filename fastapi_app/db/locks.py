@@ -0,0 +1,31 @@
+import zlib
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fastapi_app.db.session import async_engine
+
+
+@asynccontextmanager
+async def open_exclusive_session(name: str) -> AsyncIterator[AsyncSession | None]:
+    async with async_engine.connect() as conn:
+        lock_key = None
+        if conn.dialect.name == "postgresql":
+            lock_key = zlib.crc32(name.encode("utf-8"))
+            locked = await conn.scalar(select(func.pg_try_advisory_lock(lock_key)))
+            await conn.commit()
+            if not locked:
+                yield None
+                return
+
+        try:
+            async with AsyncSession(
+                bind=conn, autoflush=False, expire_on_commit=False
+            ) as db:
+                yield db
+        finally:
+            if lock_key is not None:
+                await conn.execute(select(func.pg_advisory_unlock(lock_key)))
+                await conn.commit()
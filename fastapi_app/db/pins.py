@@ -0,0 +1,35 @@
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from fastapi_app.core.cache import CacheBackend, cache
+from fastapi_app.core.config import settings
+
+
+class PrimaryPins:
+    def __init__(self, backend: CacheBackend, ttl: int) -> None:
+        self.backend = backend
+        self.ttl = ttl
+
+    async def pin(self, user_id: int) -> None:
+        if self.ttl > 0:
+            await self.backend.set(f"primary-pin:{user_id}", 1, ttl=self.ttl)
+
+    async def is_pinned(self, user_id: int) -> bool:
+        return await self.backend.get(f"primary-pin:{user_id}") is not None
+
+
+primary_pins = PrimaryPins(backend=cache, ttl=settings.replica_pin_seconds)
+
+
+@event.listens_for(Session, "after_commit")
+def record_committed_writer(session: Session) -> None:
+    user_id = session.info.get("user_id")
+    if user_id is not None and settings.database_replica_urls:
+        session.info["pin_user_id"] = user_id
+
+
+async def pin_committed_writer(db: AsyncSession) -> None:
+    user_id = db.info.pop("pin_user_id", None)
+    if user_id is not None:
+        await primary_pins.pin(user_id)
@@ -0,0 +1,122 @@
+import os
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import URL, Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from fastapi_app.core.config import settings
+
+
+class PoolMetrics:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.connections_opened = 0
+        self.invalidations = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def record_checkout(self, wait_seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait_seconds += wait_seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.checkout_failures += 1
+
+    def record_connect(self) -> None:
+        with self._lock:
+            self.connections_opened += 1
+
+    def record_invalidation(self) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            average_wait = (
+                self.total_wait_seconds / self.checkouts if self.checkouts else 0.0
+            )
+            return {
+                "checkouts": self.checkouts,
+                "checkout_failures": self.checkout_failures,
+                "connections_opened": self.connections_opened,
+                "invalidations": self.invalidations,
+                "average_wait_ms": round(average_wait * 1000, 3),
+                "max_wait_ms": round(self.max_wait_seconds * 1000, 3),
+            }
+
+
+pool_metrics: dict[str, PoolMetrics] = {}
+instrumented_engines: dict[str, Engine] = {}
+
+
+def get_pool_metrics(name: str) -> PoolMetrics:
+    return pool_metrics.setdefault(name, PoolMetrics())
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    def connect(self):
+        metrics = get_pool_metrics(self._orig_logging_name or "default")
+        started = time.perf_counter()
+
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            metrics.record_failure()
+            raise
+
+        metrics.record_checkout(time.perf_counter() - started)
+        return connection
+
+
+def get_engine_options(url: URL, name: str) -> dict:
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return {}
+
+    return {
+        "poolclass": InstrumentedAsyncQueuePool,
+        "pool_logging_name": name,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    metrics = get_pool_metrics(name)
+    instrumented_engines[name] = engine
+
+    event.listen(engine, "connect", lambda *args: metrics.record_connect())
+    event.listen(engine, "invalidate", lambda *args: metrics.record_invalidation())
+
+
+def get_pool_status() -> dict:
+    pools = {}
+
+    for name, engine in instrumented_engines.items():
+        pool: Pool = engine.pool
+        status = {"pool_class": type(pool).__name__}
+        if isinstance(pool, QueuePool):
+            status.update(
+                {
+                    "size": pool.size(),
+                    "checked_out": pool.checkedout(),
+                    "checked_in": pool.checkedin(),
+                    "overflow": pool.overflow(),
+                    "max_overflow": settings.db_max_overflow,
+                    "timeout": pool.timeout(),
+                }
+            )
+        status.update(get_pool_metrics(name).snapshot())
+        pools[name] = status
+
+    return {"pid": os.getpid(), "pools": pools}
@@ -0,0 +1,91 @@
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from fastapi_app.core.config import settings
+from fastapi_app.db.pins import primary_pins
+from fastapi_app.db.pool import get_engine_options, instrument_engine
+from fastapi_app.db.session import AsyncSessionLocal, get_async_database_url
+
+
+class ReplicaSet:
+    def __init__(self, session_makers: list[async_sessionmaker], retry_after: int):
+        self.session_makers = session_makers
+        self.retry_after = retry_after
+        self._lock = threading.Lock()
+        self._next = 0
+        self._unavailable_until: dict[int, float] = {}
+
+    def get_candidates(self) -> list[int]:
+        count = len(self.session_makers)
+        if not count:
+            return []
+
+        with self._lock:
+            start = self._next
+            self._next = (start + 1) % count
+            now = time.monotonic()
+            return [
+                index
+                for index in ((start + offset) % count for offset in range(count))
+                if self._unavailable_until.get(index, 0.0) <= now
+            ]
+
+    def mark_unavailable(self, index: int) -> None:
+        with self._lock:
+            self._unavailable_until[index] = time.monotonic() + self.retry_after
+
+
+def create_replica_session_maker(index: int, database_url: str) -> async_sessionmaker:
+    async_url = get_async_database_url(database_url)
+    name = f"replica_{index}"
+    replica_engine = create_async_engine(
+        async_url,
+        **get_engine_options(make_url(async_url), name=name),
+    )
+    instrument_engine(replica_engine.sync_engine, name=name)
+    return async_sessionmaker(
+        bind=replica_engine,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+
+replica_set = ReplicaSet(
+    session_makers=[
+        create_replica_session_maker(index, database_url)
+        for index, database_url in enumerate(settings.database_replica_urls)
+    ],
+    retry_after=settings.replica_retry_seconds,
+)
+
+
+@asynccontextmanager
+async def open_read_session(user_id: int | None) -> AsyncIterator[AsyncSession]:
+    if replica_set.session_makers and (
+        user_id is None or not await primary_pins.is_pinned(user_id)
+    ):
+        for index in replica_set.get_candidates():
+            db = replica_set.session_makers[index]()
+            try:
+                await db.connection()
+            except PoolTimeoutError:
+                await db.close()
+                continue
+            except (DBAPIError, OSError):
+                await db.close()
+                replica_set.mark_unavailable(index)
+                continue
+
+            async with db:
+                yield db
+            return
+
+    async with AsyncSessionLocal() as db:
+        yield db
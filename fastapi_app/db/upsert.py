@@ -0,0 +1,36 @@
+from collections.abc import Callable
+
+from sqlalchemy import Delete, Executable, FromClause, Insert, literal, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def get_insert(db: AsyncSession) -> Callable[..., Insert]:
+    if db.get_bind().dialect.name == "sqlite":
+        return sqlite.insert
+    return postgresql.insert
+
+
+async def execute_with_counters(
+    db: AsyncSession,
+    stmt: Insert | Delete,
+    build_counter_writes: Callable[[FromClause], list[Executable]],
+) -> bool:
+    if db.get_bind().dialect.name == "postgresql":
+        changed = stmt.cte("changed")
+        counter_writes = [
+            counter_write.cte(f"counter_write_{index}")
+            for index, counter_write in enumerate(build_counter_writes(changed))
+        ]
+        query = select(literal(1)).select_from(changed).add_cte(*counter_writes)
+        return (await db.execute(query)).first() is not None
+
+    row = (await db.execute(stmt)).first()
+    if row is None:
+        return False
+    changed = select(
+        *[literal(value).label(key) for key, value in row._mapping.items()]
+    ).subquery("changed")
+    for counter_write in build_counter_writes(changed):
+        await db.execute(counter_write)
+    return True
@@ -1,20 +1,26 @@
-from fastapi import Depends, HTTPException, status
+import hmac
+from typing import AsyncGenerator
+
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jwt import ExpiredSignatureError, InvalidTokenError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from fastapi_app.core.config import settings
 from fastapi_app.core.security import decode_token
-from fastapi_app.db.session import get_db
+from fastapi_app.db.replica import open_read_session
+from fastapi_app.db.session import get_async_db
 from fastapi_app.models.user import User
+from fastapi_app.services.user_service import get_user_by_id
 
 security = HTTPBearer()
 optional_security = HTTPBearer(auto_error=False)
 
 
-def get_current_user(
+async def get_current_user_id(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
-) -> User:
+    db: AsyncSession = Depends(get_async_db),
+) -> int:
     token = credentials.credentials
 
     try:
@@ -44,7 +50,15 @@ def get_current_user(
             detail="Invalid token subject",
         )
 
-    user = db.get(User, user_id_int)
+    db.info["user_id"] = user_id_int
+    return user_id_int
+
+
+async def get_current_user(
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db),
+) -> User:
+    user = await get_user_by_id(db=db, user_id=user_id)
 
     if not user:
         raise HTTPException(
@@ -55,7 +69,7 @@ def get_current_user(
     return user
 
 
-def get_refresh_user_id(
+async def get_refresh_user_id(
     credentials: HTTPAuthorizationCredentials = Depends(security),
 ) -> int:
     token = credentials.credentials
@@ -90,7 +104,7 @@ def get_refresh_user_id(
         )
 
 
-def get_optional_current_user_id(
+async def get_optional_current_user_id(
     credentials: HTTPAuthorizationCredentials | None = Depends(optional_security),
 ) -> int | None:
     if credentials is None:
@@ -110,3 +124,58 @@ def get_optional_current_user_id(
         return int(user_id)
     except (TypeError, ValueError):
         return None
+
+
+async def require_metrics_token(
+    x_metrics_token: str | None = Header(default=None),
+) -> None:
+    if not settings.metrics_token:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Not Found",
+        )
+
+    if x_metrics_token is None or not hmac.compare_digest(
+        x_metrics_token, settings.metrics_token
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid metrics token",
+        )
+
+
+async def get_read_db(
+    current_user_id: int | None = Depends(get_optional_current_user_id),
+) -> AsyncGenerator[AsyncSession, None]:
+    async with open_read_session(user_id=current_user_id) as db:
+        yield db
+
+
+def parse_batch_ids(value: str, name: str = "ids") -> list[int]:
+    try:
+        ids = [int(item) for item in value.split(",") if item.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{name} must be a comma-separated list of integers",
+        )
+
+    ids = list(dict.fromkeys(ids))
+    if not ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{name} must not be empty",
+        )
+    if len(ids) > settings.batch_max_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{name} accepts at most {settings.batch_max_ids} values",
+        )
+
+    return ids
+
+
+async def get_batch_ids(ids: str | None = None) -> list[int] | None:
+    if ids is None:
+        return None
+    return parse_batch_ids(ids)
@@ -1,13 +1,53 @@
+import asyncio
 import os
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from fastapi_app.api.v1.router import api_router
+from fastapi_app.api.v2.router import api_router as api_v2_router
+from fastapi_app.core.compression import CompressionMiddleware
+from fastapi_app.core.config import settings
+from fastapi_app.scripts.compact_counters import run_compactor
+from fastapi_app.scripts.flush_like_counters import run_flusher
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    tasks = []
+    if settings.like_counter_flush_interval > 0:
+        tasks.append(
+            asyncio.create_task(
+                run_flusher(
+                    interval=settings.like_counter_flush_interval,
+                    batch_size=settings.like_counter_flush_batch_size,
+                )
+            )
+        )
+    if settings.counter_compaction_interval > 0:
+        tasks.append(
+            asyncio.create_task(
+                run_compactor(
+                    interval=settings.counter_compaction_interval,
+                    batch_size=settings.counter_compaction_batch_size,
+                )
+            )
+        )
+
+    yield
+
+    for task in tasks:
+        task.cancel()
+    for task in tasks:
+        with suppress(asyncio.CancelledError):
+            await task
+
 
 app = FastAPI(
     title="Social API",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 cors_origins = os.getenv("CORS_ORIGINS", "*")
@@ -20,10 +60,12 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(CompressionMiddleware)
 
 app.include_router(api_router, prefix="/api/v1")
+app.include_router(api_v2_router, prefix="/api/v2")
 
 
 @app.get("/")
-def health_check():
+async def health_check():
     return {"message": "FastAPI Social API is running"}
@@ -0,0 +1,115 @@
+"""timeline entries and denormalized counters
+
+Revision ID: 0002_timeline_and_counters
+Revises: 0001_baseline
+Create Date: 2026-10-18 00:00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from fastapi_app.core.config import settings
+
+revision: str = "0002_timeline_and_counters"
+down_revision: Union[str, None] = "0001_baseline"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNTER_COLUMNS = [
+    ("posts", "likes_count"),
+    ("posts", "comment_count"),
+    ("comments", "likes_count"),
+]
+
+COUNTER_BACKFILLS = {
+    ("posts", "likes_count"): (
+        "SELECT COUNT(*) FROM post_likes WHERE post_likes.post_id = posts.id"
+    ),
+    ("posts", "comment_count"): (
+        "SELECT COUNT(*) FROM comments WHERE comments.post_id = posts.id"
+    ),
+    ("comments", "likes_count"): (
+        "SELECT COUNT(*) FROM comment_likes "
+        "WHERE comment_likes.comment_id = comments.id"
+    ),
+}
+
+
+def backfill_timeline_entries() -> None:
+    op.execute(
+        "INSERT INTO timeline_entries (user_id, post_id, author_id, created_at) "
+        "SELECT posts.user_id, posts.id, posts.user_id, posts.created_at FROM posts"
+    )
+    op.get_bind().execute(
+        sa.text(
+            "INSERT INTO timeline_entries (user_id, post_id, author_id, created_at) "
+            "SELECT follows.follower_id, posts.id, posts.user_id, posts.created_at "
+            "FROM follows JOIN posts ON posts.user_id = follows.following_id "
+            "WHERE follows.follower_id != follows.following_id "
+            "AND follows.following_id IN ("
+            "SELECT following_id FROM follows GROUP BY following_id "
+            "HAVING COUNT(*) < :threshold)"
+        ),
+        {"threshold": settings.timeline_fanout_threshold},
+    )
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    if not inspector.has_table("timeline_entries"):
+        op.create_table(
+            "timeline_entries",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("user_id", sa.Integer(), nullable=False),
+            sa.Column("post_id", sa.Integer(), nullable=False),
+            sa.Column("author_id", sa.Integer(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.ForeignKeyConstraint(["author_id"], ["users.id"]),
+            sa.ForeignKeyConstraint(["post_id"], ["posts.id"]),
+            sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+            sa.PrimaryKeyConstraint("id"),
+            sa.UniqueConstraint("user_id", "post_id", name="unique_timeline_entry"),
+        )
+        op.create_index(
+            "ix_timeline_entries_user_id_created_at",
+            "timeline_entries",
+            ["user_id", "created_at", "post_id"],
+        )
+        op.create_index(
+            "ix_timeline_entries_post_id",
+            "timeline_entries",
+            ["post_id"],
+        )
+        backfill_timeline_entries()
+
+    for table_name, column_name in COUNTER_COLUMNS:
+        existing_columns = {
+            column["name"] for column in inspector.get_columns(table_name)
+        }
+        if column_name not in existing_columns:
+            op.add_column(
+                table_name,
+                sa.Column(
+                    column_name, sa.Integer(), server_default="0", nullable=False
+                ),
+            )
+            op.execute(
+                f"UPDATE {table_name} SET {column_name} = "
+                f"({COUNTER_BACKFILLS[table_name, column_name]})"
+            )
+
+
+def downgrade() -> None:
+    for table_name, column_name in reversed(COUNTER_COLUMNS):
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.drop_column(column_name)
+
+    op.drop_index("ix_timeline_entries_post_id", table_name="timeline_entries")
+    op.drop_index(
+        "ix_timeline_entries_user_id_created_at", table_name="timeline_entries"
+    )
+    op.drop_table("timeline_entries")
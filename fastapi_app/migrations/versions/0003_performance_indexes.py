@@ -0,0 +1,52 @@
+"""secondary indexes for hot service queries
+
+Revision ID: 0003_performance_indexes
+Revises: 0002_timeline_and_counters
+Create Date: 2026-10-18 00:00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "0003_performance_indexes"
+down_revision: Union[str, None] = "0002_timeline_and_counters"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("ix_posts_created_at_id", "posts", ["created_at", "id"]),
+    ("ix_posts_user_id_created_at_id", "posts", ["user_id", "created_at", "id"]),
+    (
+        "ix_comments_post_id_created_at_id",
+        "comments",
+        ["post_id", "created_at", "id"],
+    ),
+    ("ix_follows_following_id_id", "follows", ["following_id", "id"]),
+    ("ix_post_likes_post_id_id", "post_likes", ["post_id", "id"]),
+    ("ix_comment_likes_comment_id_id", "comment_likes", ["comment_id", "id"]),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for index_name, table_name, columns in INDEXES:
+            op.create_index(
+                index_name,
+                table_name,
+                columns,
+                if_not_exists=True,
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for index_name, table_name, _ in reversed(INDEXES):
+            op.drop_index(
+                index_name,
+                table_name=table_name,
+                if_exists=True,
+                postgresql_concurrently=True,
+            )
@@ -0,0 +1,36 @@
+"""version markers for conditional requests
+
+Revision ID: 0004_etag_versions
+Revises: 0003_performance_indexes
+Create Date: 2026-10-18 00:00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0004_etag_versions"
+down_revision: Union[str, None] = "0003_performance_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+VERSION_COLUMNS = [
+    ("posts", "version"),
+    ("users", "version"),
+]
+
+
+def upgrade() -> None:
+    for table_name, column_name in VERSION_COLUMNS:
+        op.add_column(
+            table_name,
+            sa.Column(column_name, sa.Integer(), server_default="1", nullable=False),
+        )
+
+
+def downgrade() -> None:
+    for table_name, column_name in reversed(VERSION_COLUMNS):
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.drop_column(column_name)
@@ -0,0 +1,35 @@
+"""journal of unflushed post like deltas
+
+Revision ID: 0005_post_like_deltas
+Revises: 0004_etag_versions
+Create Date: 2026-10-18 00:00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0005_post_like_deltas"
+down_revision: Union[str, None] = "0004_etag_versions"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "post_like_deltas",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("post_id", sa.Integer(), nullable=False),
+        sa.Column("delta", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_post_like_deltas_post_id", "post_like_deltas", ["post_id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_post_like_deltas_post_id", table_name="post_like_deltas")
+    op.drop_table("post_like_deltas")
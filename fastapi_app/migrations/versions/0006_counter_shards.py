@@ -0,0 +1,63 @@
+"""sharded counters and follow count columns
+
+Revision ID: 0006_counter_shards
+Revises: 0005_post_like_deltas
+Create Date: 2026-10-18 00:00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0006_counter_shards"
+down_revision: Union[str, None] = "0005_post_like_deltas"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = [
+    ("posts", "counter_shards", "1"),
+    ("users", "counter_shards", "1"),
+    ("users", "followers_count", "0"),
+    ("users", "following_count", "0"),
+]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "counter_shards",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("counter", sa.String(length=32), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=False),
+        sa.Column("shard", sa.Integer(), nullable=False),
+        sa.Column("value", sa.Integer(), server_default="0", nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "counter", "entity_id", "shard", name="unique_counter_shard"
+        ),
+    )
+
+    for table_name, column_name, default in COLUMNS:
+        op.add_column(
+            table_name,
+            sa.Column(
+                column_name, sa.Integer(), server_default=default, nullable=False
+            ),
+        )
+
+    op.execute(
+        "UPDATE users SET "
+        "followers_count = (SELECT COUNT(*) FROM follows "
+        "WHERE follows.following_id = users.id), "
+        "following_count = (SELECT COUNT(*) FROM follows "
+        "WHERE follows.follower_id = users.id)"
+    )
+
+
+def downgrade() -> None:
+    for table_name, column_name, _ in reversed(COLUMNS):
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.drop_column(column_name)
+
+    op.drop_table("counter_shards")
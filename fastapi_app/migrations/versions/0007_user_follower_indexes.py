@@ -0,0 +1,44 @@
+"""indexes for finding pull authors by follower count
+
+Revision ID: 0007_user_follower_indexes
+Revises: 0006_counter_shards
+Create Date: 2026-10-18 00:00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "0007_user_follower_indexes"
+down_revision: Union[str, None] = "0006_counter_shards"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("ix_users_followers_count", "followers_count"),
+    ("ix_users_counter_shards", "counter_shards"),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for index_name, column_name in INDEXES:
+            op.create_index(
+                index_name,
+                "users",
+                [column_name],
+                if_not_exists=True,
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for index_name, _ in reversed(INDEXES):
+            op.drop_index(
+                index_name,
+                table_name="users",
+                if_exists=True,
+                postgresql_concurrently=True,
+            )
@@ -0,0 +1,20 @@
+from sqlalchemy import Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from fastapi_app.db.base import Base
+
+
+class CounterShard(Base):
+    __tablename__ = "counter_shards"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    counter: Mapped[str] = mapped_column(String(32), nullable=False)
+    entity_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    shard: Mapped[int] = mapped_column(Integer, nullable=False)
+    value: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+
+    __table_args__ = (
+        UniqueConstraint("counter", "entity_id", "shard", name="unique_counter_shard"),
+    )
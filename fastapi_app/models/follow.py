@@ -1,4 +1,4 @@
-from sqlalchemy import ForeignKey, Integer, UniqueConstraint
+from sqlalchemy import ForeignKey, Index, Integer, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from fastapi_app.db.base import Base
@@ -21,4 +21,5 @@ class Follow(Base):
 
     __table_args__ = (
         UniqueConstraint("follower_id", "following_id", name="unique_follow"),
+        Index("ix_follows_following_id_id", "following_id", "id"),
     )
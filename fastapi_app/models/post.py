@@ -1,6 +1,14 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, UniqueConstraint
+from sqlalchemy import (
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from fastapi_app.db.base import Base
@@ -26,6 +34,18 @@ class Post(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.now, nullable=False
     )
+    likes_count: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    comment_count: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    version: Mapped[int] = mapped_column(
+        Integer, default=1, server_default="1", nullable=False
+    )
+    counter_shards: Mapped[int] = mapped_column(
+        Integer, default=1, server_default="1", nullable=False
+    )
 
     user = relationship(User)
     comments = relationship("Comment", back_populates="post", cascade="all, delete")
@@ -34,6 +54,11 @@ class Post(Base):
         "PostImage", back_populates="post", cascade="all, delete-orphan"
     )
 
+    __table_args__ = (
+        Index("ix_posts_created_at_id", "created_at", "id"),
+        Index("ix_posts_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
+
 
 class Comment(Base):
     __tablename__ = "comments"
@@ -45,6 +70,9 @@ class Comment(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.now, nullable=False
     )
+    likes_count: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
 
     user = relationship(User)
     post = relationship("Post", back_populates="comments")
@@ -52,6 +80,10 @@ class Comment(Base):
         "CommentLikes", back_populates="comment", cascade="all, delete"
     )
 
+    __table_args__ = (
+        Index("ix_comments_post_id_created_at_id", "post_id", "created_at", "id"),
+    )
+
 
 class PostLikes(Base):
     __tablename__ = "post_likes"
@@ -63,7 +95,10 @@ class PostLikes(Base):
     user = relationship(User)
     post = relationship("Post", back_populates="likes")
 
-    __table_args__ = (UniqueConstraint("user_id", "post_id", name="post_like"),)
+    __table_args__ = (
+        UniqueConstraint("user_id", "post_id", name="post_like"),
+        Index("ix_post_likes_post_id_id", "post_id", "id"),
+    )
 
 
 class CommentLikes(Base):
@@ -76,4 +111,17 @@ class CommentLikes(Base):
     user = relationship(User)
     comment = relationship("Comment", back_populates="likes")
 
-    __table_args__ = (UniqueConstraint("user_id", "comment_id", name="comment_like"),)
+    __table_args__ = (
+        UniqueConstraint("user_id", "comment_id", name="comment_like"),
+        Index("ix_comment_likes_comment_id_id", "comment_id", "id"),
+    )
+
+
+class PostLikeDelta(Base):
+    __tablename__ = "post_like_deltas"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    post_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    delta: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    __table_args__ = (Index("ix_post_like_deltas_post_id", "post_id"),)
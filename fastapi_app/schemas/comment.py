@@ -37,12 +37,21 @@ class CommentItemResponse(BaseModel):
 class CommentListResponse(BaseModel):
     page: int
     per_page: int
-    total: int
+    total: int | None
+    next_cursor: str | None = None
     comments: list[CommentItemResponse]
     status: str | None = None
     data: dict | None = None
 
 
+class CommentPageResponse(BaseModel):
+    page: int
+    per_page: int
+    total: int | None
+    next_cursor: str | None = None
+    comments: list[CommentItemResponse]
+
+
 class CommentCreatedResponse(BaseModel):
     id: int
     user_id: int
@@ -54,5 +63,6 @@ class CommentCreatedResponse(BaseModel):
 class CommentLikeUsersResponse(BaseModel):
     page: int
     per_page: int
-    total: int
+    total: int | None
+    next_cursor: str | None = None
     data: list[UserListItemResponse]
@@ -38,12 +38,25 @@ class PostItemResponse(BaseModel):
 class PostListResponse(BaseModel):
     page: int
     per_page: int
-    total: int
+    total: int | None
+    next_cursor: str | None = None
     posts: list[PostItemResponse]
     status: str | None = None
     data: dict | None = None
 
 
+class PostPageResponse(BaseModel):
+    page: int
+    per_page: int
+    total: int | None
+    next_cursor: str | None = None
+    posts: list[PostItemResponse]
+
+
+class PostBatchResponse(BaseModel):
+    posts: list[PostItemResponse]
+
+
 class PostDetailResponse(BaseModel):
     post: PostItemResponse
     status: str | None = None
@@ -58,5 +71,6 @@ class PostCreatedResponse(BaseModel):
 class LikeUsersResponse(BaseModel):
     page: int
     per_page: int
-    total: int
+    total: int | None
+    next_cursor: str | None = None
     data: list[UserListItemResponse]
@@ -12,6 +12,27 @@ class UserMeResponse(BaseModel):
     data: dict | None = None
 
 
+class UserProfileResponse(BaseModel):
+    id: int
+    username: str
+    email: str
+    full_name: str | None
+    avatar: str | None
+    desc: str | None
+
+
+class UserPublicProfileResponse(BaseModel):
+    id: int
+    username: str
+    full_name: str | None
+    avatar: str | None
+    desc: str | None
+
+
+class UserBatchResponse(BaseModel):
+    users: list[UserPublicProfileResponse]
+
+
 class UserPublicResponse(BaseModel):
     id: int
     username: str
@@ -57,7 +78,8 @@ class UserListItemResponse(BaseModel):
 class UserListResponse(BaseModel):
     page: int
     per_page: int
-    total: int
+    total: int | None
+    next_cursor: str | None = None
     data: list[UserListItemResponse]
     status: str | None = None
 
@@ -66,3 +88,12 @@ class IsFollowingResponse(BaseModel):
     is_following: bool
     status: str | None = None
     data: dict | None = None
+
+
+class LikeStateResponse(BaseModel):
+    posts: dict[int, bool]
+    comments: dict[int, bool]
+
+
+class FollowStateResponse(BaseModel):
+    following: dict[int, bool]
@@ -0,0 +1,45 @@
+import argparse
+import asyncio
+import logging
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from fastapi_app.core.config import settings
+from fastapi_app.db.locks import open_exclusive_session
+from fastapi_app.services.counter_service import compact_counter_shards
+
+logger = logging.getLogger(__name__)
+
+
+async def compact(batch_size: int) -> int:
+    async with open_exclusive_session("compact_counters") as db:
+        if db is None:
+            return 0
+        return await compact_counter_shards(db=db, batch_size=batch_size)
+
+
+async def run_compactor(interval: float, batch_size: int) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await compact(batch_size)
+        except (SQLAlchemyError, OSError):
+            logger.exception("Compacting counter shards failed")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Fold counter shard rows into their base counter columns."
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=settings.counter_compaction_batch_size
+    )
+    args = parser.parse_args()
+
+    compacted = asyncio.run(compact(args.batch_size))
+
+    print(f"Compacted {compacted} counter shards")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import argparse
+import asyncio
+import logging
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from fastapi_app.core.config import settings
+from fastapi_app.db.locks import open_exclusive_session
+from fastapi_app.services.counter_service import flush_post_like_deltas
+
+logger = logging.getLogger(__name__)
+
+
+async def flush(batch_size: int) -> int:
+    async with open_exclusive_session("flush_like_counters") as db:
+        if db is None:
+            return 0
+        return await flush_post_like_deltas(db=db, batch_size=batch_size)
+
+
+async def run_flusher(interval: float, batch_size: int) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await flush(batch_size)
+        except (SQLAlchemyError, OSError):
+            logger.exception("Flushing post like deltas failed")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Apply journaled like deltas to posts.likes_count."
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=settings.like_counter_flush_batch_size
+    )
+    args = parser.parse_args()
+
+    flushed = asyncio.run(flush(args.batch_size))
+
+    print(f"Flushed {flushed} like deltas")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import argparse
+import asyncio
+
+from fastapi_app.db.session import AsyncSessionLocal
+from fastapi_app.services.counter_service import (
+    reconcile_comment_counters,
+    reconcile_post_counters,
+    reconcile_user_counters,
+)
+
+
+async def reconcile(batch_size: int) -> tuple[int, int, int]:
+    async with AsyncSessionLocal() as db:
+        posts_repaired = await reconcile_post_counters(db=db, batch_size=batch_size)
+        comments_repaired = await reconcile_comment_counters(
+            db=db, batch_size=batch_size
+        )
+        users_repaired = await reconcile_user_counters(db=db, batch_size=batch_size)
+    return posts_repaired, comments_repaired, users_repaired
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Repair denormalized like, comment and follow counters."
+    )
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    posts_repaired, comments_repaired, users_repaired = asyncio.run(
+        reconcile(args.batch_size)
+    )
+
+    print(
+        f"Repaired {posts_repaired} posts, {comments_repaired} comments "
+        f"and {users_repaired} users"
+    )
+
+
+if __name__ == "__main__":
+    main()
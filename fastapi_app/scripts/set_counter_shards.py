@@ -0,0 +1,34 @@
+import argparse
+import asyncio
+
+from fastapi_app.db.session import AsyncSessionLocal
+from fastapi_app.services.counter_service import SHARDED_MODELS, set_counter_shards
+
+
+async def update_shards(entity: str, entity_id: int, shards: int) -> bool:
+    async with AsyncSessionLocal() as db:
+        return await set_counter_shards(
+            db=db, entity=entity, entity_id=entity_id, shards=shards
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Set how many counter shards a hot post or user writes to."
+    )
+    parser.add_argument("entity", choices=sorted(SHARDED_MODELS))
+    parser.add_argument("entity_id", type=int)
+    parser.add_argument("shards", type=int)
+    args = parser.parse_args()
+
+    if args.shards < 1:
+        parser.error("shards must be at least 1")
+
+    if not asyncio.run(update_shards(args.entity, args.entity_id, args.shards)):
+        parser.exit(1, f"{args.entity} {args.entity_id} not found\n")
+
+    print(f"Set {args.entity} {args.entity_id} to {args.shards} counter shards")
+
+
+if __name__ == "__main__":
+    main()
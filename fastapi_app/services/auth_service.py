@@ -1,15 +1,58 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
 import bcrypt
-from sqlalchemy import or_
+from sqlalchemy import or_, select, update
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from fastapi_app.core.config import settings
+from fastapi_app.db.session import AsyncSessionLocal
 from fastapi_app.models.user import User
 from fastapi_app.schemas.auth import LoginRequest, RegisterRequest
 
 
+class PasswordPoolFullError(RuntimeError):
+    pass
+
+
+class PasswordWorkPool:
+    def __init__(self, workers: int, queue_limit: int) -> None:
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix="password",
+        )
+
+    def _release(self, _future) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        with self._lock:
+            if self._pending >= self.workers + self.queue_limit:
+                raise PasswordPoolFullError()
+            self._pending += 1
+
+        future = self._executor.submit(func, *args)
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+
+password_pool = PasswordWorkPool(
+    workers=settings.password_hash_workers,
+    queue_limit=settings.password_hash_queue_limit,
+)
+
+
 def hash_password(password: str) -> str:
     password_bytes = password.encode("utf-8")
-    hashed = bcrypt.hashpw(password_bytes, bcrypt.gensalt())
+    hashed = bcrypt.hashpw(password_bytes, bcrypt.gensalt(settings.bcrypt_rounds))
     return hashed.decode("utf-8")
 
 
@@ -19,8 +62,30 @@ def verify_password(password: str, password_hash: str) -> bool:
     return bcrypt.checkpw(password_bytes, password_hash_bytes)
 
 
-def register_user(db: Session, payload: RegisterRequest) -> User:
-    password_hash = hash_password(payload.password)
+def password_needs_rehash(password_hash: str) -> bool:
+    return int(password_hash.split("$")[2]) != settings.bcrypt_rounds
+
+
+async def rehash_password(user_id: int, password_hash: str, password: str) -> None:
+    try:
+        new_hash = await password_pool.run(hash_password, password)
+    except PasswordPoolFullError:
+        return
+
+    async with AsyncSessionLocal() as db:
+        try:
+            await db.execute(
+                update(User)
+                .where(User.id == user_id, User.password_hash == password_hash)
+                .values(password_hash=new_hash)
+            )
+            await db.commit()
+        except SQLAlchemyError:
+            await db.rollback()
+
+
+async def register_user(db: AsyncSession, payload: RegisterRequest) -> User:
+    password_hash = await password_pool.run(hash_password, payload.password)
     user = User(
         username=payload.username,
         email=payload.email,
@@ -29,39 +94,45 @@ def register_user(db: Session, payload: RegisterRequest) -> User:
 
     try:
         db.add(user)
-        db.commit()
-        db.refresh(user)
+        await db.commit()
+        await db.refresh(user)
     except SQLAlchemyError:
-        db.rollback()
+        await db.rollback()
         raise
 
     return user
 
 
-def authenticate_user(db: Session, payload: LoginRequest) -> User | None:
-    user = get_user_by_login(db=db, account=payload.username)
+async def authenticate_user(db: AsyncSession, payload: LoginRequest) -> User | None:
+    user = await get_user_by_login(db=db, account=payload.username)
 
     if not user:
         return None
-    if not verify_password(payload.password, user.password_hash):
+    if not await password_pool.run(
+        verify_password, payload.password, user.password_hash
+    ):
         return None
+    if password_needs_rehash(user.password_hash):
+        await rehash_password(
+            user_id=user.id,
+            password_hash=user.password_hash,
+            password=payload.password,
+        )
 
     return user
 
 
-def get_user_by_username_or_email(
-    db: Session, username: str, email: str
+async def get_user_by_username_or_email(
+    db: AsyncSession, username: str, email: str
 ) -> User | None:
-    return (
-        db.query(User)
-        .filter(or_(User.username == username, User.email == email))
-        .first()
+    return await db.scalar(
+        select(User).where(or_(User.username == username, User.email == email)).limit(1)
     )
 
 
-def get_user_by_login(db: Session, account: str) -> User | None:
-    return (
-        db.query(User)
-        .filter(or_(User.username == account, User.email == account))
-        .first()
+async def get_user_by_login(db: AsyncSession, account: str) -> User | None:
+    return await db.scalar(
+        select(User)
+        .where(or_(User.username == account, User.email == account))
+        .limit(1)
     )
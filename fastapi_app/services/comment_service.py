@@ -1,16 +1,34 @@
-from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session
+from functools import partial
 
+from sqlalchemy import delete, literal, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from fastapi_app.core.pagination import (
+    count_rows,
+    encode_cursor,
+    paginate_by_id,
+    paginate_by_time,
+)
+from fastapi_app.core.response_cache import response_cache
+from fastapi_app.db.upsert import execute_with_counters, get_insert
 from fastapi_app.models.post import Comment, CommentLikes, Post
 from fastapi_app.models.user import User
 from fastapi_app.schemas.comment import CommentCreateRequest, CommentUpdateRequest
+from fastapi_app.services.counter_service import (
+    adjust_counter,
+    build_comment_likes_writes,
+)
 
 
-def get_comment_by_id(db: Session, comment_id: int) -> Comment | None:
-    return db.get(Comment, comment_id)
+async def get_comment_by_id(db: AsyncSession, comment_id: int) -> Comment | None:
+    return await db.get(Comment, comment_id)
 
 
-def create_comment(db: Session, user_id: int, payload: CommentCreateRequest) -> Comment:
+async def create_comment(
+    db: AsyncSession, user_id: int, payload: CommentCreateRequest
+) -> Comment:
     comment = Comment(
         user_id=user_id,
         post_id=payload.post_id,
@@ -19,111 +37,185 @@ def create_comment(db: Session, user_id: int, payload: CommentCreateRequest) ->
 
     try:
         db.add(comment)
-        db.commit()
-        db.refresh(comment)
+        await adjust_counter(
+            db=db, counter="post_comments", entity_id=payload.post_id, delta=1
+        )
+        await db.commit()
+        await db.refresh(comment)
     except SQLAlchemyError:
-        db.rollback()
+        await db.rollback()
         raise
 
+    await response_cache.invalidate(
+        f"post:{comment.post_id}", f"comments:{comment.post_id}"
+    )
     return comment
 
 
-def update_comment(
-    db: Session, comment: Comment, payload: CommentUpdateRequest
+async def update_comment(
+    db: AsyncSession, comment: Comment, payload: CommentUpdateRequest
 ) -> Comment:
     comment.content = payload.content.strip()
 
     try:
-        db.commit()
-        db.refresh(comment)
+        await db.commit()
+        await db.refresh(comment)
     except SQLAlchemyError:
-        db.rollback()
+        await db.rollback()
         raise
 
+    await response_cache.invalidate(f"comment:{comment.id}")
     return comment
 
 
-def delete_comment(db: Session, comment: Comment) -> None:
+async def delete_comment(db: AsyncSession, comment: Comment) -> None:
     try:
-        db.delete(comment)
-        db.commit()
+        await db.delete(comment)
+        await adjust_counter(
+            db=db, counter="post_comments", entity_id=comment.post_id, delta=-1
+        )
+        await db.commit()
     except SQLAlchemyError:
-        db.rollback()
+        await db.rollback()
         raise
 
+    await response_cache.invalidate(
+        f"post:{comment.post_id}", f"comments:{comment.post_id}"
+    )
+
 
-def get_post_comments(
-    db: Session, post_id: int, page: int, per_page: int
-) -> tuple[int, list[Comment]]:
-    query = (
-        db.query(Comment)
-        .filter(Comment.post_id == post_id)
-        .order_by(Comment.created_at.desc())
+def to_comment_item(comment: Comment, is_liked: bool) -> dict:
+    return {
+        "id": comment.id,
+        "user_id": comment.user_id,
+        "post_id": comment.post_id,
+        "content": comment.content,
+        "likes": comment.likes_count,
+        "username": comment.user.username,
+        "avatar": comment.user.avatar,
+        "is_liked": is_liked,
+        "created_at": comment.created_at,
+    }
+
+
+async def get_post_comments(
+    db: AsyncSession,
+    post_id: int,
+    page: int,
+    per_page: int,
+    cursor: str | None = None,
+    include_total: bool = True,
+) -> tuple[int | None, list[Comment], str | None]:
+    stmt = select(Comment).where(Comment.post_id == post_id)
+    total = await count_rows(db=db, stmt=stmt) if include_total else None
+    comments = (
+        await db.scalars(
+            paginate_by_time(
+                stmt.options(joinedload(Comment.user)),
+                Comment.created_at,
+                Comment.id,
+                page=page,
+                per_page=per_page,
+                cursor=cursor,
+            )
+        )
+    ).all()
+    next_cursor = (
+        encode_cursor(comments[-1].created_at, comments[-1].id)
+        if len(comments) == per_page
+        else None
     )
-    total = query.count()
-    comments = query.offset((page - 1) * per_page).limit(per_page).all()
-    return total, comments
+    return total, list(comments), next_cursor
 
 
-def get_user_liked_comment_ids(
-    db: Session, user_id: int | None, comment_ids: list[int]
+async def get_user_liked_comment_ids(
+    db: AsyncSession, user_id: int | None, comment_ids: list[int]
 ) -> set[int]:
     if not user_id or not comment_ids:
         return set()
-    likes = (
-        db.query(CommentLikes)
-        .filter(
+    liked_comment_ids = await db.scalars(
+        select(CommentLikes.comment_id).where(
             CommentLikes.user_id == user_id,
             CommentLikes.comment_id.in_(comment_ids),
         )
-        .all()
     )
-    return {like.comment_id for like in likes}
+    return set(liked_comment_ids.all())
 
 
-def get_comment_like(db: Session, user_id: int, comment_id: int) -> CommentLikes | None:
-    return (
-        db.query(CommentLikes)
-        .filter(CommentLikes.user_id == user_id, CommentLikes.comment_id == comment_id)
-        .first()
+async def like_comment(db: AsyncSession, user_id: int, comment_id: int) -> bool:
+    stmt = (
+        get_insert(db)(CommentLikes)
+        .from_select(
+            ["user_id", "comment_id"],
+            select(literal(user_id), Comment.id).where(Comment.id == comment_id),
+        )
+        .on_conflict_do_nothing(index_elements=["user_id", "comment_id"])
+        .returning(CommentLikes.comment_id)
     )
 
-
-def like_comment(db: Session, user_id: int, comment_id: int) -> CommentLikes:
-    like = CommentLikes(user_id=user_id, comment_id=comment_id)
-
     try:
-        db.add(like)
-        db.commit()
-        db.refresh(like)
+        liked = await execute_with_counters(
+            db=db,
+            stmt=stmt,
+            build_counter_writes=partial(build_comment_likes_writes, delta=1),
+        )
+        await db.commit()
     except SQLAlchemyError:
-        db.rollback()
+        await db.rollback()
         raise
 
-    return like
+    if liked:
+        await response_cache.invalidate(f"comment:{comment_id}")
+    return liked
 
 
-def unlike_comment(db: Session, like: CommentLikes) -> None:
+async def unlike_comment(db: AsyncSession, user_id: int, comment_id: int) -> bool:
+    stmt = (
+        delete(CommentLikes)
+        .where(CommentLikes.user_id == user_id, CommentLikes.comment_id == comment_id)
+        .returning(CommentLikes.comment_id)
+    )
+
     try:
-        db.delete(like)
-        db.commit()
+        unliked = await execute_with_counters(
+            db=db,
+            stmt=stmt,
+            build_counter_writes=partial(build_comment_likes_writes, delta=-1),
+        )
+        await db.commit()
     except SQLAlchemyError:
-        db.rollback()
+        await db.rollback()
         raise
 
-
-def get_comment_like_users(
-    db: Session, comment_id: int, page: int, per_page: int
-) -> tuple[int, list[User]]:
-    query = (
-        db.query(User)
+    if unliked:
+        await response_cache.invalidate(f"comment:{comment_id}")
+    return unliked
+
+
+async def get_comment_like_users(
+    db: AsyncSession,
+    comment_id: int,
+    page: int,
+    per_page: int,
+    cursor: str | None = None,
+    include_total: bool = True,
+) -> tuple[int | None, list[User], str | None]:
+    stmt = (
+        select(User, CommentLikes.id)
         .join(CommentLikes, CommentLikes.user_id == User.id)
-        .filter(CommentLikes.comment_id == comment_id)
+        .where(CommentLikes.comment_id == comment_id)
     )
-    total = query.count()
-    users = query.offset((page - 1) * per_page).limit(per_page).all()
-    return total, users
+    total = await count_rows(db=db, stmt=stmt) if include_total else None
+    rows = (
+        await db.execute(
+            paginate_by_id(
+                stmt, CommentLikes.id, page=page, per_page=per_page, cursor=cursor
+            )
+        )
+    ).all()
+    next_cursor = encode_cursor(rows[-1][1]) if len(rows) == per_page else None
+    return total, [user for user, _ in rows], next_cursor
 
 
-def post_exists(db: Session, post_id: int) -> bool:
-    return db.get(Post, post_id) is not None
+async def post_exists(db: AsyncSession, post_id: int) -> bool:
+    return await db.get(Post, post_id) is not None
@@ -0,0 +1,374 @@
+import random
+from collections import defaultdict
+
+from sqlalchemy import (
+    Executable,
+    FromClause,
+    Select,
+    bindparam,
+    case,
+    delete,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fastapi_app.core.config import settings
+from fastapi_app.db.upsert import get_insert
+from fastapi_app.models.counter import CounterShard
+from fastapi_app.models.follow import Follow
+from fastapi_app.models.post import (
+    Comment,
+    CommentLikes,
+    Post,
+    PostLikeDelta,
+    PostLikes,
+)
+from fastapi_app.models.user import User
+
+COUNTER_COLUMNS = {
+    "post_likes": (Post, "likes_count"),
+    "post_comments": (Post, "comment_count"),
+    "user_followers": (User, "followers_count"),
+    "user_following": (User, "following_count"),
+}
+SHARDED_MODELS = {"post": Post, "user": User}
+
+
+def get_pending_post_likes():
+    return (
+        select(func.coalesce(func.sum(PostLikeDelta.delta), 0))
+        .where(PostLikeDelta.post_id == Post.id)
+        .scalar_subquery()
+    )
+
+
+def get_counter_shard_sum(counter: str):
+    model, _ = COUNTER_COLUMNS[counter]
+    shard_sum = (
+        select(func.coalesce(func.sum(CounterShard.value), 0))
+        .where(CounterShard.counter == counter, CounterShard.entity_id == model.id)
+        .scalar_subquery()
+    )
+    return case((model.counter_shards > 1, shard_sum), else_=0)
+
+
+def get_counter_column(counter: str):
+    model, column_name = COUNTER_COLUMNS[counter]
+    column = getattr(model, column_name) + get_counter_shard_sum(counter)
+    if counter == "post_likes" and settings.like_counter_flush_interval > 0:
+        column = column + get_pending_post_likes()
+    return column
+
+
+def build_counter_writes(
+    db: AsyncSession, counter: str, entity_ids: Select, delta: int
+) -> list[Executable]:
+    model, column_name = COUNTER_COLUMNS[counter]
+    entities = model.__table__
+
+    shard_write = get_insert(db)(CounterShard).from_select(
+        ["counter", "entity_id", "shard", "value"],
+        select(
+            literal(counter),
+            entities.c.id,
+            literal(random.randrange(1 << 30)) % entities.c.counter_shards,
+            literal(delta),
+        ).where(entities.c.id.in_(entity_ids), entities.c.counter_shards > 1),
+    )
+    shard_write = shard_write.on_conflict_do_update(
+        index_elements=["counter", "entity_id", "shard"],
+        set_={"value": CounterShard.value + shard_write.excluded.value},
+    )
+
+    is_cold = (entities.c.id.in_(entity_ids), entities.c.counter_shards <= 1)
+    if counter == "post_likes" and settings.like_counter_flush_interval > 0:
+        direct_write = insert(PostLikeDelta).from_select(
+            ["post_id", "delta"],
+            select(entities.c.id, literal(delta)).where(*is_cold),
+        )
+    else:
+        direct_write = (
+            update(entities)
+            .where(*is_cold)
+            .values({column_name: entities.c[column_name] + delta})
+        )
+
+    return [shard_write, direct_write]
+
+
+def build_changed_counter_writes(
+    changed: FromClause, db: AsyncSession, counters: list[tuple[str, str, int]]
+) -> list[Executable]:
+    return [
+        counter_write
+        for counter, column_name, delta in counters
+        for counter_write in build_counter_writes(
+            db, counter, select(changed.c[column_name]), delta
+        )
+    ]
+
+
+async def adjust_counter(
+    db: AsyncSession, counter: str, entity_id: int, delta: int
+) -> None:
+    for counter_write in build_counter_writes(
+        db, counter, select(literal(entity_id)), delta
+    ):
+        await db.execute(counter_write)
+
+
+async def apply_counter_totals(db: AsyncSession, rows) -> None:
+    totals = defaultdict(int)
+    for counter, entity_id, delta in rows:
+        totals[counter, entity_id] += delta
+
+    for counter in sorted({counter for counter, _ in totals}):
+        model, column_name = COUNTER_COLUMNS[counter]
+        entities = model.__table__
+        params = [
+            {"target_id": entity_id, "delta": total}
+            for (row_counter, entity_id), total in sorted(totals.items())
+            if row_counter == counter and total
+        ]
+        if params:
+            await db.execute(
+                update(entities)
+                .where(entities.c.id == bindparam("target_id"))
+                .values({column_name: entities.c[column_name] + bindparam("delta")}),
+                params,
+            )
+
+
+async def flush_post_like_deltas(db: AsyncSession, batch_size: int) -> int:
+    flushed = 0
+
+    while True:
+        batch_ids = (
+            select(PostLikeDelta.id).order_by(PostLikeDelta.id).limit(batch_size)
+        )
+        rows = (
+            await db.execute(
+                delete(PostLikeDelta)
+                .where(PostLikeDelta.id.in_(batch_ids))
+                .returning(PostLikeDelta.post_id, PostLikeDelta.delta)
+            )
+        ).all()
+        if not rows:
+            await db.commit()
+            break
+
+        await apply_counter_totals(
+            db, [("post_likes", post_id, delta) for post_id, delta in rows]
+        )
+        await db.commit()
+        flushed += len(rows)
+
+        if len(rows) < batch_size:
+            break
+
+    return flushed
+
+
+async def compact_counter_shards(db: AsyncSession, batch_size: int) -> int:
+    compacted = 0
+
+    while True:
+        batch_ids = select(CounterShard.id).order_by(CounterShard.id).limit(batch_size)
+        rows = (
+            await db.execute(
+                delete(CounterShard)
+                .where(CounterShard.id.in_(batch_ids))
+                .returning(
+                    CounterShard.counter, CounterShard.entity_id, CounterShard.value
+                )
+            )
+        ).all()
+        if not rows:
+            await db.commit()
+            break
+
+        await apply_counter_totals(db, rows)
+        await db.commit()
+        compacted += len(rows)
+
+        if len(rows) < batch_size:
+            break
+
+    return compacted
+
+
+async def set_counter_shards(
+    db: AsyncSession, entity: str, entity_id: int, shards: int
+) -> bool:
+    model = SHARDED_MODELS[entity]
+    entities = model.__table__
+    counters = [
+        counter
+        for counter, (counter_model, _) in COUNTER_COLUMNS.items()
+        if counter_model is model
+    ]
+
+    result = await db.execute(
+        update(entities)
+        .where(entities.c.id == entity_id)
+        .values(counter_shards=max(shards, 1))
+    )
+    if not result.rowcount:
+        await db.rollback()
+        return False
+
+    if shards <= 1:
+        rows = (
+            await db.execute(
+                delete(CounterShard)
+                .where(
+                    CounterShard.counter.in_(counters),
+                    CounterShard.entity_id == entity_id,
+                )
+                .returning(
+                    CounterShard.counter, CounterShard.entity_id, CounterShard.value
+                )
+            )
+        ).all()
+        await apply_counter_totals(db, rows)
+
+    await db.commit()
+    return True
+
+
+def build_comment_likes_writes(changed: FromClause, delta: int) -> list[Executable]:
+    return [
+        update(Comment)
+        .where(Comment.id.in_(select(changed.c.comment_id)))
+        .values(likes_count=Comment.likes_count + delta)
+        .execution_options(synchronize_session=False)
+    ]
+
+
+async def reconcile_post_counters(db: AsyncSession, batch_size: int) -> int:
+    likes_count = (
+        select(func.count(PostLikes.id))
+        .where(PostLikes.post_id == Post.id)
+        .scalar_subquery()
+    ) - (get_counter_column("post_likes") - Post.likes_count)
+    comment_count = (
+        select(func.count(Comment.id))
+        .where(Comment.post_id == Post.id)
+        .scalar_subquery()
+    ) - get_counter_shard_sum("post_comments")
+    repaired = 0
+    last_id = 0
+
+    while True:
+        post_ids = (
+            await db.scalars(
+                select(Post.id)
+                .where(Post.id > last_id)
+                .order_by(Post.id)
+                .limit(batch_size)
+            )
+        ).all()
+        if not post_ids:
+            break
+
+        result = await db.execute(
+            update(Post)
+            .where(
+                Post.id.in_(post_ids),
+                or_(
+                    Post.likes_count != likes_count,
+                    Post.comment_count != comment_count,
+                ),
+            )
+            .values(likes_count=likes_count, comment_count=comment_count)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        repaired += result.rowcount
+        last_id = post_ids[-1]
+
+    return repaired
+
+
+async def reconcile_comment_counters(db: AsyncSession, batch_size: int) -> int:
+    likes_count = (
+        select(func.count(CommentLikes.id))
+        .where(CommentLikes.comment_id == Comment.id)
+        .scalar_subquery()
+    )
+    repaired = 0
+    last_id = 0
+
+    while True:
+        comment_ids = (
+            await db.scalars(
+                select(Comment.id)
+                .where(Comment.id > last_id)
+                .order_by(Comment.id)
+                .limit(batch_size)
+            )
+        ).all()
+        if not comment_ids:
+            break
+
+        result = await db.execute(
+            update(Comment)
+            .where(Comment.id.in_(comment_ids), Comment.likes_count != likes_count)
+            .values(likes_count=likes_count)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        repaired += result.rowcount
+        last_id = comment_ids[-1]
+
+    return repaired
+
+
+async def reconcile_user_counters(db: AsyncSession, batch_size: int) -> int:
+    followers_count = (
+        select(func.count(Follow.id))
+        .where(Follow.following_id == User.id)
+        .scalar_subquery()
+    ) - get_counter_shard_sum("user_followers")
+    following_count = (
+        select(func.count(Follow.id))
+        .where(Follow.follower_id == User.id)
+        .scalar_subquery()
+    ) - get_counter_shard_sum("user_following")
+    repaired = 0
+    last_id = 0
+
+    while True:
+        user_ids = (
+            await db.scalars(
+                select(User.id)
+                .where(User.id > last_id)
+                .order_by(User.id)
+                .limit(batch_size)
+            )
+        ).all()
+        if not user_ids:
+            break
+
+        result = await db.execute(
+            update(User)
+            .where(
+                User.id.in_(user_ids),
+                or_(
+                    User.followers_count != followers_count,
+                    User.following_count != following_count,
+                ),
+            )
+            .values(followers_count=followers_count, following_count=following_count)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        repaired += result.rowcount
+        last_id = user_ids[-1]
+
+    return repaired
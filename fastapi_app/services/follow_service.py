@@ -1,94 +1,174 @@
+from functools import partial
+
+from sqlalchemy import delete, literal, select
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from fastapi_app.core.pagination import count_rows, encode_cursor, paginate_by_id
+from fastapi_app.db.upsert import execute_with_counters, get_insert
 from fastapi_app.models.follow import Follow
 from fastapi_app.models.user import User
-
-
-def get_follow(
-    db: Session,
+from fastapi_app.services.counter_service import (
+    build_changed_counter_writes,
+    get_counter_column,
+)
+from fastapi_app.services.timeline_service import (
+    backfill_author_posts,
+    remove_author_from_timeline,
+)
+
+
+async def get_follow(
+    db: AsyncSession,
     follower_id: int,
     following_id: int,
 ) -> Follow | None:
-    return (
-        db.query(Follow)
-        .filter(
+    return await db.scalar(
+        select(Follow).where(
             Follow.follower_id == follower_id,
             Follow.following_id == following_id,
         )
-        .first()
     )
 
 
-def follow_user(
-    db: Session,
+async def follow_user(
+    db: AsyncSession,
     follower_id: int,
     following_id: int,
-) -> Follow:
-    follow = Follow(
-        follower_id=follower_id,
-        following_id=following_id,
+) -> bool:
+    stmt = (
+        get_insert(db)(Follow)
+        .from_select(
+            ["follower_id", "following_id"],
+            select(literal(follower_id), User.id).where(User.id == following_id),
+        )
+        .on_conflict_do_nothing(index_elements=["follower_id", "following_id"])
+        .returning(Follow.follower_id, Follow.following_id)
     )
 
     try:
-        db.add(follow)
-        db.commit()
-        db.refresh(follow)
+        if not await execute_with_counters(
+            db=db,
+            stmt=stmt,
+            build_counter_writes=partial(
+                build_changed_counter_writes,
+                db=db,
+                counters=[
+                    ("user_followers", "following_id", 1),
+                    ("user_following", "follower_id", 1),
+                ],
+            ),
+        ):
+            await db.rollback()
+            return False
+        await backfill_author_posts(db=db, user_id=follower_id, author_id=following_id)
+        await db.commit()
     except SQLAlchemyError:
-        db.rollback()
+        await db.rollback()
         raise
 
-    return follow
+    return True
 
 
-def unfollow_user(db: Session, follow: Follow) -> None:
+async def unfollow_user(db: AsyncSession, follower_id: int, following_id: int) -> bool:
+    stmt = (
+        delete(Follow)
+        .where(
+            Follow.follower_id == follower_id,
+            Follow.following_id == following_id,
+        )
+        .returning(Follow.follower_id, Follow.following_id)
+    )
+
     try:
-        db.delete(follow)
-        db.commit()
+        if not await execute_with_counters(
+            db=db,
+            stmt=stmt,
+            build_counter_writes=partial(
+                build_changed_counter_writes,
+                db=db,
+                counters=[
+                    ("user_followers", "following_id", -1),
+                    ("user_following", "follower_id", -1),
+                ],
+            ),
+        ):
+            await db.rollback()
+            return False
+        await remove_author_from_timeline(
+            db=db,
+            user_id=follower_id,
+            author_id=following_id,
+        )
+        await db.commit()
     except SQLAlchemyError:
-        db.rollback()
+        await db.rollback()
         raise
 
+    return True
 
-def get_follow_stats(db: Session, user_id: int) -> dict[str, int]:
-    followers_count = db.query(Follow).filter(Follow.following_id == user_id).count()
-    following_count = db.query(Follow).filter(Follow.follower_id == user_id).count()
-
-    return {
-        "followers_count": followers_count,
-        "following_count": following_count,
-    }
 
-
-def get_followers(
-    db: Session, user_id: int, page: int, per_page: int
-) -> tuple[int, list[User]]:
-    query = (
-        db.query(User)
+async def get_follow_stats(db: AsyncSession, user_id: int) -> dict[str, int] | None:
+    row = (
+        await db.execute(
+            select(
+                get_counter_column("user_followers").label("followers_count"),
+                get_counter_column("user_following").label("following_count"),
+            ).where(User.id == user_id)
+        )
+    ).first()
+    return dict(row._mapping) if row else None
+
+
+async def get_followers(
+    db: AsyncSession,
+    user_id: int,
+    page: int,
+    per_page: int,
+    cursor: str | None = None,
+    include_total: bool = True,
+) -> tuple[int | None, list[User], str | None]:
+    stmt = (
+        select(User, Follow.id)
         .join(Follow, Follow.follower_id == User.id)
-        .filter(Follow.following_id == user_id)
+        .where(Follow.following_id == user_id)
     )
-    total = query.count()
-    users = query.offset((page - 1) * per_page).limit(per_page).all()
-    return total, users
-
-
-def get_following(
-    db: Session, user_id: int, page: int, per_page: int
-) -> tuple[int, list[User]]:
-    query = (
-        db.query(User)
+    total = await count_rows(db=db, stmt=stmt) if include_total else None
+    rows = (
+        await db.execute(
+            paginate_by_id(stmt, Follow.id, page=page, per_page=per_page, cursor=cursor)
+        )
+    ).all()
+    next_cursor = encode_cursor(rows[-1][1]) if len(rows) == per_page else None
+    return total, [user for user, _ in rows], next_cursor
+
+
+async def get_following(
+    db: AsyncSession,
+    user_id: int,
+    page: int,
+    per_page: int,
+    cursor: str | None = None,
+    include_total: bool = True,
+) -> tuple[int | None, list[User], str | None]:
+    stmt = (
+        select(User, Follow.id)
         .join(Follow, Follow.following_id == User.id)
-        .filter(Follow.follower_id == user_id)
+        .where(Follow.follower_id == user_id)
     )
-    total = query.count()
-    users = query.offset((page - 1) * per_page).limit(per_page).all()
-    return total, users
+    total = await count_rows(db=db, stmt=stmt) if include_total else None
+    rows = (
+        await db.execute(
+            paginate_by_id(stmt, Follow.id, page=page, per_page=per_page, cursor=cursor)
+        )
+    ).all()
+    next_cursor = encode_cursor(rows[-1][1]) if len(rows) == per_page else None
+    return total, [user for user, _ in rows], next_cursor
 
 
-def is_following(db: Session, follower_id: int, following_id: int) -> bool:
+async def is_following(db: AsyncSession, follower_id: int, following_id: int) -> bool:
     return (
-        get_follow(
+        await get_follow(
             db=db,
             follower_id=follower_id,
             following_id=following_id,
@@ -97,5 +177,19 @@ def is_following(db: Session, follower_id: int, following_id: int) -> bool:
     )
 
 
-def user_exists(db: Session, user_id: int) -> bool:
-    return db.get(User, user_id) is not None
+async def get_following_ids(
+    db: AsyncSession, follower_id: int, user_ids: list[int]
+) -> set[int]:
+    if not user_ids:
+        return set()
+    following_ids = await db.scalars(
+        select(Follow.following_id).where(
+            Follow.follower_id == follower_id,
+            Follow.following_id.in_(user_ids),
+        )
+    )
+    return set(following_ids.all())
+
+
+async def user_exists(db: AsyncSession, user_id: int) -> bool:
+    return await db.get(User, user_id) is not None
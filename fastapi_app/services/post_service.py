@@ -1,147 +1,422 @@
-from sqlalchemy import func
-from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session
+import threading
+import time
+from functools import partial
 
-from fastapi_app.models.post import Comment, Post, PostImage, PostLikes
+from sqlalchemy import Row, Select, delete, exists, func, literal, select, text
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fastapi_app.core.config import settings
+from fastapi_app.core.response_cache import response_cache
+from fastapi_app.core.pagination import (
+    count_rows,
+    encode_cursor,
+    paginate_by_id,
+    paginate_by_time,
+)
+from fastapi_app.db.upsert import execute_with_counters, get_insert
+from fastapi_app.models.post import Post, PostImage, PostLikes
 from fastapi_app.models.user import User
 from fastapi_app.schemas.post import PostCreateRequest, PostUpdateRequest
+from fastapi_app.services.counter_service import (
+    build_changed_counter_writes,
+    get_counter_column,
+)
+from fastapi_app.services.timeline_service import (
+    fan_out_post,
+    remove_post_from_timelines,
+)
+
+
+class CountCache:
+    def __init__(self, ttl: int) -> None:
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._value: tuple[float, int] | None = None
+
+    def get(self) -> int | None:
+        with self._lock:
+            if self._value is None:
+                return None
+            loaded_at, value = self._value
+            if time.monotonic() - loaded_at > self.ttl:
+                return None
+            return value
+
+    def set(self, value: int) -> None:
+        with self._lock:
+            self._value = (time.monotonic(), value)
 
 
-def get_post_by_id(db: Session, post_id: int) -> Post | None:
-    return db.get(Post, post_id)
+post_count_cache = CountCache(ttl=settings.post_count_cache_ttl)
 
 
-def create_post(db: Session, user_id: int, payload: PostCreateRequest) -> Post:
+async def get_post_by_id(db: AsyncSession, post_id: int) -> Post | None:
+    return await db.get(Post, post_id)
+
+
+async def create_post(
+    db: AsyncSession, user_id: int, payload: PostCreateRequest
+) -> Post:
     post = Post(user_id=user_id, content=payload.content.strip())
 
     try:
         db.add(post)
-        db.flush()
+        await db.flush()
         for image_url in payload.images:
             db.add(PostImage(post_id=post.id, image_url=image_url))
-        db.commit()
-        db.refresh(post)
+        await fan_out_post(db=db, post=post)
+        await db.commit()
+        await db.refresh(post)
     except SQLAlchemyError:
-        db.rollback()
+        await db.rollback()
         raise
 
+    await response_cache.invalidate("posts", f"user_posts:{user_id}")
     return post
 
 
-def update_post(db: Session, post: Post, payload: PostUpdateRequest) -> Post:
+async def update_post(db: AsyncSession, post: Post, payload: PostUpdateRequest) -> Post:
     post.content = payload.content.strip()
+    post.version = Post.version + 1
 
     try:
-        db.commit()
-        db.refresh(post)
+        await db.commit()
+        await db.refresh(post)
     except SQLAlchemyError:
-        db.rollback()
+        await db.rollback()
         raise
 
+    await response_cache.invalidate(f"post:{post.id}")
     return post
 
 
-def delete_post(db: Session, post: Post) -> None:
+async def delete_post(db: AsyncSession, post: Post) -> None:
     try:
-        db.delete(post)
-        db.commit()
+        await remove_post_from_timelines(db=db, post=post)
+        await db.delete(post)
+        await db.commit()
     except SQLAlchemyError:
-        db.rollback()
+        await db.rollback()
         raise
 
-
-def get_posts(db: Session, page: int, per_page: int) -> tuple[int, list[Post]]:
-    query = db.query(Post).order_by(Post.created_at.desc())
-    total = query.count()
-    posts = query.offset((page - 1) * per_page).limit(per_page).all()
-    return total, posts
-
-
-def get_posts_by_user(
-    db: Session, user_id: int, page: int, per_page: int
-) -> tuple[int, list[Post]]:
-    query = (
-        db.query(Post).filter(Post.user_id == user_id).order_by(Post.created_at.desc())
+    await response_cache.invalidate(
+        "posts",
+        f"post:{post.id}",
+        f"user_posts:{post.user_id}",
+        f"comments:{post.id}",
     )
-    total = query.count()
-    posts = query.offset((page - 1) * per_page).limit(per_page).all()
-    return total, posts
 
 
-def get_post_like_counts(db: Session, post_ids: list[int]) -> dict[int, int]:
+def build_post_items_query(db: AsyncSession, viewer_id: int | None) -> Select:
+    if db.get_bind().dialect.name == "postgresql":
+        image_urls = func.string_agg(
+            PostImage.image_url, aggregate_order_by(literal("\n"), PostImage.id)
+        )
+    else:
+        image_urls = func.group_concat(PostImage.image_url, "\n")
+    images = select(image_urls).where(PostImage.post_id == Post.id).scalar_subquery()
+
+    if viewer_id:
+        is_liked = exists().where(
+            PostLikes.post_id == Post.id, PostLikes.user_id == viewer_id
+        )
+    else:
+        is_liked = literal(False)
+
+    return select(
+        Post.id,
+        Post.user_id,
+        Post.content,
+        Post.created_at,
+        User.username,
+        User.avatar,
+        images.label("images"),
+        get_counter_column("post_likes").label("likes"),
+        is_liked.label("is_liked"),
+        get_counter_column("post_comments").label("comment_count"),
+    ).join(User, User.id == Post.user_id)
+
+
+def to_post_item(row: Row) -> dict:
+    item = dict(row._mapping)
+    item["images"] = item["images"].split("\n") if item["images"] else []
+    item["is_liked"] = bool(item["is_liked"])
+    return item
+
+
+def to_post_etag_marker(
+    version: int, likes: int, comment_count: int, author_version: int, is_liked
+) -> tuple:
+    return (version, likes, comment_count, author_version, bool(is_liked))
+
+
+async def get_post_item_with_marker(
+    db: AsyncSession, post_id: int, viewer_id: int | None
+) -> tuple[dict, tuple] | None:
+    row = (
+        await db.execute(
+            build_post_items_query(db=db, viewer_id=viewer_id)
+            .add_columns(
+                Post.version.label("version"), User.version.label("author_version")
+            )
+            .where(Post.id == post_id)
+        )
+    ).first()
+    if not row:
+        return None
+
+    item = to_post_item(row)
+    marker = to_post_etag_marker(
+        item.pop("version"),
+        item["likes"],
+        item["comment_count"],
+        item.pop("author_version"),
+        item["is_liked"],
+    )
+    return item, marker
+
+
+async def get_post_etag_marker(
+    db: AsyncSession, post_id: int, viewer_id: int | None
+) -> tuple | None:
+    if viewer_id:
+        is_liked = exists().where(
+            PostLikes.post_id == Post.id, PostLikes.user_id == viewer_id
+        )
+    else:
+        is_liked = literal(False)
+
+    row = (
+        await db.execute(
+            select(
+                Post.version,
+                get_counter_column("post_likes"),
+                get_counter_column("post_comments"),
+                User.version,
+                is_liked,
+            )
+            .join(User, User.id == Post.user_id)
+            .where(Post.id == post_id)
+        )
+    ).first()
+    return to_post_etag_marker(*row) if row else None
+
+
+async def get_post_items_by_ids(
+    db: AsyncSession, post_ids: list[int], viewer_id: int | None
+) -> list[dict]:
+    if not post_ids:
+        return []
+    rows = (
+        await db.execute(
+            build_post_items_query(db=db, viewer_id=viewer_id).where(
+                Post.id.in_(post_ids)
+            )
+        )
+    ).all()
+    items_by_id = {row.id: to_post_item(row) for row in rows}
+    return [items_by_id[post_id] for post_id in post_ids if post_id in items_by_id]
+
+
+async def get_posts(
+    db: AsyncSession,
+    page: int,
+    per_page: int,
+    cursor: str | None = None,
+    include_total: bool = True,
+    approximate_total: bool = False,
+    viewer_id: int | None = None,
+) -> tuple[int | None, list[dict], str | None]:
+    if not include_total:
+        total = None
+    elif approximate_total:
+        total = await get_approximate_post_count(db=db)
+    else:
+        total = await db.scalar(select(func.count(Post.id)))
+    rows = (
+        await db.execute(
+            paginate_by_time(
+                build_post_items_query(db=db, viewer_id=viewer_id),
+                Post.created_at,
+                Post.id,
+                page=page,
+                per_page=per_page,
+                cursor=cursor,
+            )
+        )
+    ).all()
+    items = [to_post_item(row) for row in rows]
+    return total, items, get_next_post_cursor(items=items, per_page=per_page)
+
+
+async def get_posts_by_user(
+    db: AsyncSession,
+    user_id: int,
+    page: int,
+    per_page: int,
+    cursor: str | None = None,
+    include_total: bool = True,
+    viewer_id: int | None = None,
+) -> tuple[int | None, list[dict], str | None]:
+    total = (
+        await db.scalar(select(func.count(Post.id)).where(Post.user_id == user_id))
+        if include_total
+        else None
+    )
+    rows = (
+        await db.execute(
+            paginate_by_time(
+                build_post_items_query(db=db, viewer_id=viewer_id).where(
+                    Post.user_id == user_id
+                ),
+                Post.created_at,
+                Post.id,
+                page=page,
+                per_page=per_page,
+                cursor=cursor,
+            )
+        )
+    ).all()
+    items = [to_post_item(row) for row in rows]
+    return total, items, get_next_post_cursor(items=items, per_page=per_page)
+
+
+async def get_approximate_post_count(db: AsyncSession) -> int:
+    if db.get_bind().dialect.name == "postgresql":
+        estimate = await db.scalar(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'posts'::regclass")
+        )
+        if estimate is not None and estimate >= 0:
+            return estimate
+
+    total = post_count_cache.get()
+    if total is None:
+        total = await db.scalar(select(func.count(Post.id)))
+        post_count_cache.set(total)
+    return total
+
+
+def get_next_post_cursor(items: list[dict], per_page: int) -> str | None:
+    if len(items) < per_page:
+        return None
+    return encode_cursor(items[-1]["created_at"], items[-1]["id"])
+
+
+async def get_post_like_counts(db: AsyncSession, post_ids: list[int]) -> dict[int, int]:
     if not post_ids:
         return {}
-    return dict(
-        db.query(PostLikes.post_id, func.count(PostLikes.user_id))
-        .filter(PostLikes.post_id.in_(post_ids))
-        .group_by(PostLikes.post_id)
-        .all()
+    rows = await db.execute(
+        select(Post.id, get_counter_column("post_likes")).where(Post.id.in_(post_ids))
     )
+    return dict(rows.all())
 
 
-def get_post_comment_counts(db: Session, post_ids: list[int]) -> dict[int, int]:
+async def get_post_comment_counts(
+    db: AsyncSession, post_ids: list[int]
+) -> dict[int, int]:
     if not post_ids:
         return {}
-    return dict(
-        db.query(Comment.post_id, func.count(Comment.id))
-        .filter(Comment.post_id.in_(post_ids))
-        .group_by(Comment.post_id)
-        .all()
+    rows = await db.execute(
+        select(Post.id, get_counter_column("post_comments")).where(
+            Post.id.in_(post_ids)
+        )
     )
+    return dict(rows.all())
 
 
-def get_user_liked_post_ids(
-    db: Session, user_id: int | None, post_ids: list[int]
+async def get_user_liked_post_ids(
+    db: AsyncSession, user_id: int | None, post_ids: list[int]
 ) -> set[int]:
     if not user_id or not post_ids:
         return set()
-    likes = (
-        db.query(PostLikes)
-        .filter(PostLikes.user_id == user_id, PostLikes.post_id.in_(post_ids))
-        .all()
+    liked_post_ids = await db.scalars(
+        select(PostLikes.post_id).where(
+            PostLikes.user_id == user_id, PostLikes.post_id.in_(post_ids)
+        )
     )
-    return {like.post_id for like in likes}
-
-
-def get_post_like(db: Session, user_id: int, post_id: int) -> PostLikes | None:
-    return (
-        db.query(PostLikes)
-        .filter(PostLikes.user_id == user_id, PostLikes.post_id == post_id)
-        .first()
+    return set(liked_post_ids.all())
+
+
+async def like_post(db: AsyncSession, user_id: int, post_id: int) -> bool:
+    stmt = (
+        get_insert(db)(PostLikes)
+        .from_select(
+            ["user_id", "post_id"],
+            select(literal(user_id), Post.id).where(Post.id == post_id),
+        )
+        .on_conflict_do_nothing(index_elements=["user_id", "post_id"])
+        .returning(PostLikes.post_id)
     )
 
-
-def like_post(db: Session, user_id: int, post_id: int) -> PostLikes:
-    like = PostLikes(user_id=user_id, post_id=post_id)
-
     try:
-        db.add(like)
-        db.commit()
-        db.refresh(like)
+        liked = await execute_with_counters(
+            db=db,
+            stmt=stmt,
+            build_counter_writes=partial(
+                build_changed_counter_writes,
+                db=db,
+                counters=[("post_likes", "post_id", 1)],
+            ),
+        )
+        await db.commit()
     except SQLAlchemyError:
-        db.rollback()
+        await db.rollback()
         raise
 
-    return like
+    if liked:
+        await response_cache.invalidate(f"post:{post_id}")
+    return liked
 
 
-def unlike_post(db: Session, like: PostLikes) -> None:
+async def unlike_post(db: AsyncSession, user_id: int, post_id: int) -> bool:
+    stmt = (
+        delete(PostLikes)
+        .where(PostLikes.user_id == user_id, PostLikes.post_id == post_id)
+        .returning(PostLikes.post_id)
+    )
+
     try:
-        db.delete(like)
-        db.commit()
+        unliked = await execute_with_counters(
+            db=db,
+            stmt=stmt,
+            build_counter_writes=partial(
+                build_changed_counter_writes,
+                db=db,
+                counters=[("post_likes", "post_id", -1)],
+            ),
+        )
+        await db.commit()
     except SQLAlchemyError:
-        db.rollback()
+        await db.rollback()
         raise
 
-
-def get_post_like_users(
-    db: Session, post_id: int, page: int, per_page: int
-) -> tuple[int, list[User]]:
-    query = (
-        db.query(User)
+    if unliked:
+        await response_cache.invalidate(f"post:{post_id}")
+    return unliked
+
+
+async def get_post_like_users(
+    db: AsyncSession,
+    post_id: int,
+    page: int,
+    per_page: int,
+    cursor: str | None = None,
+    include_total: bool = True,
+) -> tuple[int | None, list[User], str | None]:
+    stmt = (
+        select(User, PostLikes.id)
         .join(PostLikes, PostLikes.user_id == User.id)
-        .filter(PostLikes.post_id == post_id)
+        .where(PostLikes.post_id == post_id)
     )
-    total = query.count()
-    users = query.offset((page - 1) * per_page).limit(per_page).all()
-    return total, users
+    total = await count_rows(db=db, stmt=stmt) if include_total else None
+    rows = (
+        await db.execute(
+            paginate_by_id(
+                stmt, PostLikes.id, page=page, per_page=per_page, cursor=cursor
+            )
+        )
+    ).all()
+    next_cursor = encode_cursor(rows[-1][1]) if len(rows) == per_page else None
+    return total, [user for user, _ in rows], next_cursor
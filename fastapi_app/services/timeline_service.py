@@ -0,0 +1,279 @@
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import (
+    and_,
+    delete,
+    exists,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    tuple_,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fastapi_app.core.config import settings
+from fastapi_app.core.pagination import (
+    decode_time_cursor,
+    encode_cursor,
+    count_rows,
+    paginate_by_time,
+)
+from fastapi_app.models.follow import Follow
+from fastapi_app.models.post import Post
+from fastapi_app.models.timeline import TimelineEntry
+from fastapi_app.models.user import User
+from fastapi_app.services.counter_service import get_counter_column
+
+TIMELINE_COLUMNS = ["user_id", "post_id", "author_id", "created_at"]
+
+TimelineItem = tuple[datetime, int]
+
+
+class RecentPostsCache:
+    def __init__(self, limit: int, ttl: int) -> None:
+        self.limit = limit
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._recent_posts: dict[int, tuple[float, list[TimelineItem]]] = {}
+
+    def get_recent_posts(self, author_id: int) -> list[TimelineItem] | None:
+        with self._lock:
+            entry = self._recent_posts.get(author_id)
+            if entry is None:
+                return None
+            loaded_at, items = entry
+            if time.monotonic() - loaded_at > self.ttl:
+                del self._recent_posts[author_id]
+                return None
+            return items
+
+    def set_recent_posts(self, author_id: int, items: list[TimelineItem]) -> None:
+        with self._lock:
+            self._recent_posts[author_id] = (time.monotonic(), items[: self.limit])
+
+    def push_post(self, author_id: int, item: TimelineItem) -> None:
+        with self._lock:
+            entry = self._recent_posts.get(author_id)
+            if entry is None:
+                return
+            loaded_at, items = entry
+            items = sorted([item, *items], reverse=True)[: self.limit]
+            self._recent_posts[author_id] = (loaded_at, items)
+
+    def invalidate_author(self, author_id: int) -> None:
+        with self._lock:
+            self._recent_posts.pop(author_id, None)
+
+
+recent_posts_cache = RecentPostsCache(
+    limit=settings.timeline_recent_posts_limit,
+    ttl=settings.timeline_pull_cache_ttl,
+)
+
+
+def get_pull_author_condition():
+    threshold = settings.timeline_fanout_threshold
+    return and_(
+        or_(User.followers_count >= threshold, User.counter_shards > 1),
+        get_counter_column("user_followers") >= threshold,
+    )
+
+
+async def is_pull_author(db: AsyncSession, user_id: int) -> bool:
+    followers_count = await db.scalar(
+        select(get_counter_column("user_followers")).where(User.id == user_id)
+    )
+    return (followers_count or 0) >= settings.timeline_fanout_threshold
+
+
+async def get_followed_pull_author_ids(db: AsyncSession, user_id: int) -> list[int]:
+    return list(
+        (
+            await db.scalars(
+                select(Follow.following_id)
+                .join(User, User.id == Follow.following_id)
+                .where(Follow.follower_id == user_id, get_pull_author_condition())
+            )
+        ).all()
+    )
+
+
+async def get_author_recent_posts(
+    db: AsyncSession, author_id: int
+) -> list[TimelineItem]:
+    items = recent_posts_cache.get_recent_posts(author_id)
+    if items is not None:
+        return items
+
+    rows = (
+        await db.execute(
+            select(Post.created_at, Post.id)
+            .where(Post.user_id == author_id)
+            .order_by(Post.created_at.desc(), Post.id.desc())
+            .limit(recent_posts_cache.limit)
+        )
+    ).all()
+    items = [(created_at, post_id) for created_at, post_id in rows]
+    recent_posts_cache.set_recent_posts(author_id, items)
+    return items
+
+
+async def get_author_posts(
+    db: AsyncSession, author_id: int, before: TimelineItem | None, limit: int
+) -> list[TimelineItem]:
+    recent_items = await get_author_recent_posts(db=db, author_id=author_id)
+    items = [item for item in recent_items if before is None or item < before]
+    if len(items) >= limit or len(recent_items) < recent_posts_cache.limit:
+        return items[:limit]
+
+    older_than = items[-1] if items else before
+    stmt = select(Post.created_at, Post.id).where(Post.user_id == author_id)
+    if older_than is not None:
+        stmt = stmt.where(tuple_(Post.created_at, Post.id) < older_than)
+    rows = (
+        await db.execute(
+            stmt.order_by(Post.created_at.desc(), Post.id.desc()).limit(
+                limit - len(items)
+            )
+        )
+    ).all()
+    return items + [(created_at, post_id) for created_at, post_id in rows]
+
+
+async def fan_out_post(db: AsyncSession, post: Post) -> None:
+    db.add(
+        TimelineEntry(
+            user_id=post.user_id,
+            post_id=post.id,
+            author_id=post.user_id,
+            created_at=post.created_at,
+        )
+    )
+
+    if await is_pull_author(db=db, user_id=post.user_id):
+        recent_posts_cache.push_post(post.user_id, (post.created_at, post.id))
+        return
+
+    followers = select(
+        Follow.follower_id,
+        literal(post.id),
+        literal(post.user_id),
+        literal(post.created_at),
+    ).where(Follow.following_id == post.user_id)
+
+    await db.execute(insert(TimelineEntry).from_select(TIMELINE_COLUMNS, followers))
+
+
+async def remove_post_from_timelines(db: AsyncSession, post: Post) -> None:
+    await db.execute(delete(TimelineEntry).where(TimelineEntry.post_id == post.id))
+    recent_posts_cache.invalidate_author(post.user_id)
+
+
+async def backfill_author_posts(db: AsyncSession, user_id: int, author_id: int) -> None:
+    if await is_pull_author(db=db, user_id=author_id):
+        return
+
+    recent_posts = (
+        select(Post.id, Post.created_at)
+        .where(Post.user_id == author_id)
+        .order_by(Post.created_at.desc(), Post.id.desc())
+        .limit(settings.timeline_backfill_limit)
+        .subquery()
+    )
+    rows = select(
+        literal(user_id),
+        recent_posts.c.id,
+        literal(author_id),
+        recent_posts.c.created_at,
+    )
+
+    await db.execute(insert(TimelineEntry).from_select(TIMELINE_COLUMNS, rows))
+
+
+async def remove_author_from_timeline(
+    db: AsyncSession, user_id: int, author_id: int
+) -> None:
+    await db.execute(
+        delete(TimelineEntry).where(
+            TimelineEntry.user_id == user_id,
+            TimelineEntry.author_id == author_id,
+        )
+    )
+
+
+async def get_home_timeline(
+    db: AsyncSession,
+    user_id: int,
+    page: int,
+    per_page: int,
+    cursor: str | None = None,
+    include_total: bool = True,
+) -> tuple[int | None, list[int], str | None]:
+    stmt = select(TimelineEntry.created_at, TimelineEntry.post_id).where(
+        TimelineEntry.user_id == user_id
+    )
+    total = await count_rows(db=db, stmt=stmt) if include_total else None
+    position = decode_time_cursor(cursor) if cursor is not None else None
+    pull_author_ids = await get_followed_pull_author_ids(db=db, user_id=user_id)
+
+    if not pull_author_ids:
+        rows = (
+            await db.execute(
+                paginate_by_time(
+                    stmt,
+                    TimelineEntry.created_at,
+                    TimelineEntry.post_id,
+                    page=page,
+                    per_page=per_page,
+                    cursor=cursor,
+                )
+            )
+        ).all()
+        page_items = [tuple(row) for row in rows]
+    else:
+        if position is not None:
+            stmt = stmt.where(
+                tuple_(TimelineEntry.created_at, TimelineEntry.post_id) < position
+            )
+            window = per_page
+        else:
+            window = page * per_page
+
+        rows = (
+            await db.execute(
+                stmt.order_by(
+                    TimelineEntry.created_at.desc(), TimelineEntry.post_id.desc()
+                ).limit(window)
+            )
+        ).all()
+        pushed_items = [tuple(row) for row in rows]
+        pulled_items = [
+            item
+            for author_id in pull_author_ids
+            for item in await get_author_posts(
+                db=db, author_id=author_id, before=position, limit=window
+            )
+        ]
+        if include_total:
+            total += await db.scalar(
+                select(func.count(Post.id)).where(
+                    Post.user_id.in_(pull_author_ids),
+                    ~exists().where(
+                        TimelineEntry.user_id == user_id,
+                        TimelineEntry.post_id == Post.id,
+                    ),
+                )
+            )
+
+        merged_items = sorted(set(pushed_items) | set(pulled_items), reverse=True)
+        page_items = merged_items[window - per_page : window]
+
+    post_ids = [post_id for _, post_id in page_items]
+    next_cursor = (
+        encode_cursor(*page_items[-1]) if len(page_items) == per_page else None
+    )
+    return total, post_ids, next_cursor
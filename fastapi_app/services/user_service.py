@@ -1,17 +1,60 @@
-from sqlalchemy import or_
+from sqlalchemy import or_, select
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from fastapi_app.core.response_cache import response_cache
 from fastapi_app.models.user import User
 from fastapi_app.schemas.user import UserUpdateRequest
 
 
-def get_user_by_id(db: Session, user_id: int) -> User | None:
-    return db.get(User, user_id)
+def to_user_profile(user: User) -> dict:
+    return {
+        "id": user.id,
+        "username": user.username,
+        "email": user.email,
+        "full_name": user.full_name,
+        "avatar": user.avatar,
+        "desc": user.desc,
+    }
 
 
-def get_user_conflict_for_update(
-    db: Session, user_id: int, username: str | None, email: str | None
+def to_user_public_profile(user: User) -> dict:
+    return {
+        "id": user.id,
+        "username": user.username,
+        "full_name": user.full_name,
+        "avatar": user.avatar,
+        "desc": user.desc,
+    }
+
+
+def to_user_list_item(user: User) -> dict:
+    return {
+        "id": user.id,
+        "username": user.username,
+        "full_name": user.full_name,
+        "avatar": user.avatar,
+    }
+
+
+async def get_user_by_id(db: AsyncSession, user_id: int) -> User | None:
+    return await db.get(User, user_id)
+
+
+async def get_users_by_ids(db: AsyncSession, user_ids: list[int]) -> list[User]:
+    if not user_ids:
+        return []
+    users = (await db.scalars(select(User).where(User.id.in_(user_ids)))).all()
+    users_by_id = {user.id: user for user in users}
+    return [users_by_id[user_id] for user_id in user_ids if user_id in users_by_id]
+
+
+async def get_user_version(db: AsyncSession, user_id: int) -> int | None:
+    return await db.scalar(select(User.version).where(User.id == user_id))
+
+
+async def get_user_conflict_for_update(
+    db: AsyncSession, user_id: int, username: str | None, email: str | None
 ) -> User | None:
     conditions = []
 
@@ -24,20 +67,24 @@ def get_user_conflict_for_update(
     if not conditions:
         return None
 
-    return db.query(User).filter(or_(*conditions), User.id != user_id).first()
+    return await db.scalar(
+        select(User).where(or_(*conditions), User.id != user_id).limit(1)
+    )
 
 
-def update_user(db: Session, user: User, payload: UserUpdateRequest) -> User:
+async def update_user(db: AsyncSession, user: User, payload: UserUpdateRequest) -> User:
     update_data = payload.model_dump(exclude_unset=True)
 
     for field, value in update_data.items():
         setattr(user, field, value)
+    user.version = User.version + 1
 
     try:
-        db.commit()
-        db.refresh(user)
+        await db.commit()
+        await db.refresh(user)
     except SQLAlchemyError:
-        db.rollback()
+        await db.rollback()
         raise
 
+    await response_cache.invalidate(f"user:{user.id}")
     return user
@@ -0,0 +1,58 @@
+import os
+import tempfile
+
+DATABASE_PATH = os.path.join(tempfile.mkdtemp(), "test.db")
+
+os.environ["DATABASE_URL"] = f"sqlite:///{DATABASE_PATH}"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ.pop("DATABASE_REPLICA_URLS", None)
+os.environ.pop("CACHE_URL", None)
+os.environ["JWT_SECRET_KEY"] = "test-secret-key-for-the-test-suite"
+os.environ["BCRYPT_ROUNDS"] = "4"
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+
+from fastapi_app.core.cache import cache
+from fastapi_app.db.base import Base
+from fastapi_app.db.session import async_engine
+from fastapi_app.main import app
+from fastapi_app.models import counter, follow, post, timeline, user  # noqa: F401
+
+
+@pytest.fixture
+def client():
+    engine = create_engine(os.environ["DATABASE_URL"])
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    engine.dispose()
+    cache._entries.clear()
+    cache._counters.clear()
+
+    with TestClient(app) as test_client:
+        yield test_client
+        test_client.portal.call(async_engine.dispose)
+
+
+@pytest.fixture
+def register(client):
+    def register(username: str, password: str = "secret123") -> dict[str, str]:
+        response = client.post(
+            "/api/v1/auth/register",
+            json={
+                "username": username,
+                "email": f"{username}@example.com",
+                "password": password,
+            },
+        )
+        assert response.status_code == 201, response.text
+
+        response = client.post(
+            "/api/v1/auth/login",
+            json={"username": username, "password": password},
+        )
+        assert response.status_code == 200, response.text
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    return register
@@ -0,0 +1,52 @@
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from fastapi_app.core.config import settings
+from fastapi_app.db.session import async_engine
+from fastapi_app.services import auth_service
+
+
+class FailingCommitSession(AsyncSession):
+    async def commit(self) -> None:
+        raise OperationalError("UPDATE users", {}, Exception("database is locked"))
+
+
+def login(client, username: str):
+    return client.post(
+        "/api/v1/auth/login",
+        json={"username": username, "password": "secret123"},
+    )
+
+
+def test_login_rehashes_password_with_new_cost(client, register, monkeypatch):
+    register("alice")
+    monkeypatch.setattr(settings, "bcrypt_rounds", 5)
+
+    assert login(client, "alice").status_code == 200
+    assert not auth_service.password_needs_rehash(
+        client.portal.call(get_password_hash, "alice")
+    )
+
+
+def test_failed_rehash_does_not_fail_login(client, register, monkeypatch):
+    register("alice")
+    monkeypatch.setattr(settings, "bcrypt_rounds", 5)
+    monkeypatch.setattr(
+        auth_service,
+        "AsyncSessionLocal",
+        async_sessionmaker(bind=async_engine, class_=FailingCommitSession),
+    )
+
+    response = login(client, "alice")
+
+    assert response.status_code == 200
+    assert response.json()["access_token"]
+    assert auth_service.password_needs_rehash(
+        client.portal.call(get_password_hash, "alice")
+    )
+
+
+async def get_password_hash(username: str) -> str:
+    async with auth_service.AsyncSessionLocal() as db:
+        user = await auth_service.get_user_by_login(db=db, account=username)
+        return user.password_hash
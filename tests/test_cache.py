@@ -0,0 +1,143 @@
+import asyncio
+
+import fakeredis.aioredis
+import pytest
+
+from fastapi_app.core.cache import (
+    CacheBackend,
+    LocalCacheBackend,
+    create_cache_backend,
+)
+from fastapi_app.core.response_cache import ResponseCache
+
+
+def make_redis_backend():
+    return create_cache_backend("", client=fakeredis.aioredis.FakeRedis())
+
+
+def make_local_backend():
+    return LocalCacheBackend(max_size=100)
+
+
+BACKENDS = [make_redis_backend, make_local_backend]
+
+
+@pytest.mark.parametrize("make_backend", BACKENDS)
+def test_get_set_and_delete(make_backend):
+    async def run():
+        backend = make_backend()
+        await backend.set("entry", {"name": "alice", "ids": [1, 2]}, ttl=10)
+        await backend.set("count", 5)
+
+        assert await backend.get_many(["entry", "count", "missing"]) == [
+            {"name": "alice", "ids": [1, 2]},
+            5,
+            None,
+        ]
+
+        await backend.delete_many(["entry"])
+        assert await backend.get("entry") is None
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize("make_backend", BACKENDS)
+def test_incr_with_ttl(make_backend):
+    async def run():
+        backend = make_backend()
+        assert await backend.incr("hits", ttl=5) == 1
+        assert await backend.incr("hits", 2) == 3
+        assert await backend.incr("hits", 0, ttl=5) == 3
+        assert await backend.get("hits") == 3
+
+    asyncio.run(run())
+
+
+def test_redis_incr_sets_expiry():
+    async def run():
+        client = fakeredis.aioredis.FakeRedis()
+        backend = create_cache_backend("", client=client)
+        await backend.incr("hits", ttl=5)
+
+        assert 0 < await client.ttl(b"social:hits") <= 5
+        await backend.incr("hits")
+        assert 0 < await client.ttl(b"social:hits") <= 5
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize("make_backend", BACKENDS)
+def test_pipeline_returns_results_in_order(make_backend):
+    async def run():
+        backend = make_backend()
+        await backend.set("entry", {"value": 1})
+
+        results = await (
+            backend.pipeline()
+            .get("entry")
+            .incr("counter", ttl=10)
+            .delete_many([])
+            .set("other", "value")
+            .delete_many(["entry"])
+            .incr("counter", 3)
+            .get("other")
+            .execute()
+        )
+
+        assert results == [{"value": 1}, 1, None, None, None, 4, "value"]
+        assert await backend.get("entry") is None
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize("make_backend", BACKENDS)
+def test_response_cache_invalidation(make_backend):
+    async def run():
+        response_cache = ResponseCache(backend=make_backend(), ttl=10)
+        entry, token = await response_cache.get("/posts?")
+        assert entry is None
+
+        await response_cache.set(
+            "/posts?", {"posts": []}, tags={"posts", "post:1"}, token=token
+        )
+        entry, _ = await response_cache.get("/posts?")
+        assert entry.content == {"posts": []}
+
+        await response_cache.invalidate("post:2")
+        entry, _ = await response_cache.get("/posts?")
+        assert entry is not None
+
+        await response_cache.invalidate("post:1")
+        entry, token = await response_cache.get("/posts?")
+        assert entry is None
+
+        await response_cache.invalidate("post:1")
+        await response_cache.set(
+            "/posts?", {"posts": ["stale"]}, tags={"posts", "post:1"}, token=token
+        )
+        entry, _ = await response_cache.get("/posts?")
+        assert entry is None
+
+    asyncio.run(run())
+
+
+def test_local_counters_survive_eviction():
+    async def run():
+        backend = LocalCacheBackend(max_size=2)
+        await backend.incr("tag:post:1")
+        for index in range(5):
+            await backend.set(f"entry:{index}", {"index": index})
+
+        assert await backend.get("tag:post:1") == 1
+        assert await backend.get("entry:0") is None
+
+    asyncio.run(run())
+
+
+def test_incomplete_backend_fails_when_built():
+    class GetOnlyBackend(CacheBackend):
+        async def get_many(self, keys):
+            return [None for _ in keys]
+
+    with pytest.raises(TypeError, match="delete_many"):
+        GetOnlyBackend()
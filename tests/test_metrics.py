@@ -0,0 +1,26 @@
+from fastapi_app.core.config import settings
+
+
+def test_metrics_require_token(client, monkeypatch):
+    assert client.get("/api/v1/metrics/db-pool").status_code == 404
+
+    monkeypatch.setattr(settings, "metrics_token", "metrics-secret")
+    response = client.get(
+        "/api/v1/metrics/db-pool", headers={"X-Metrics-Token": "wrong"}
+    )
+    assert response.status_code == 403
+
+
+def test_db_pool_metrics_report_the_async_engine(client, monkeypatch):
+    monkeypatch.setattr(settings, "metrics_token", "metrics-secret")
+    client.get("/api/v2/posts")
+
+    response = client.get(
+        "/api/v1/metrics/db-pool", headers={"X-Metrics-Token": "metrics-secret"}
+    )
+
+    assert response.status_code == 200
+    pools = response.json()["pools"]
+    assert list(pools) == ["primary"]
+    assert pools["primary"]["pool_class"] == "InstrumentedAsyncQueuePool"
+    assert pools["primary"]["checkouts"] > 0
@@ -0,0 +1,132 @@
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from fastapi_app.core.response_cache import response_cache
+from fastapi_app.db.session import async_engine
+
+
+def create_post(client, headers, content: str = "hello") -> int:
+    response = client.post(
+        "/api/v1/posts", json={"content": content, "images": []}, headers=headers
+    )
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+def test_v1_and_v2_share_post_pages(client, register):
+    headers = register("alice")
+    post_id = create_post(client, headers)
+
+    v1 = client.get("/api/v1/posts?limit=5").json()
+    v2 = client.get("/api/v2/posts?per_page=5").json()
+
+    assert v2 == {
+        "page": 1,
+        "per_page": 5,
+        "total": 1,
+        "next_cursor": None,
+        "posts": v1["posts"],
+    }
+    assert v1["status"] == "success"
+    assert v1["data"]["total_post"] == 1
+    assert [post["id"] for post in v1["data"]["posts"]] == [post_id]
+
+
+def test_v1_and_v2_share_post_detail(client, register):
+    headers = register("alice")
+    post_id = create_post(client, headers)
+
+    v1 = client.get(f"/api/v1/posts/{post_id}")
+    v2 = client.get(f"/api/v2/posts/{post_id}")
+
+    assert v1.json()["post"] == v2.json()
+    assert v1.json()["data"] == {"post": v2.json()}
+    assert v1.headers["ETag"] == v2.headers["ETag"]
+    assert client.get("/api/v2/posts/999").status_code == 404
+
+
+def test_post_detail_not_modified(client, register):
+    headers = register("alice")
+    post_id = create_post(client, headers)
+    etag = client.get(f"/api/v2/posts/{post_id}").headers["ETag"]
+
+    response = client.get(f"/api/v2/posts/{post_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+
+    client.put(f"/api/v1/posts/{post_id}", json={"content": "edited"}, headers=headers)
+    response = client.get(f"/api/v2/posts/{post_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["content"] == "edited"
+    assert response.headers["ETag"] != etag
+
+
+def test_user_profile_envelopes_and_etag(client, register):
+    register("alice")
+
+    v1 = client.get("/api/v1/users/1")
+    v2 = client.get("/api/v2/users/1")
+
+    assert v1.json()["data"] == v2.json()
+    assert v2.json()["username"] == "alice"
+    etag = v2.headers["ETag"]
+    assert (
+        client.get("/api/v2/users/1", headers={"If-None-Match": etag}).status_code
+        == 304
+    )
+    assert client.get("/api/v1/users/999").status_code == 404
+
+
+@contextmanager
+def count_queries():
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+
+def test_detail_without_if_none_match_runs_one_query(client, register, monkeypatch):
+    monkeypatch.setattr(response_cache, "ttl", 0)
+    headers = register("alice")
+    post_id = create_post(client, headers)
+    etag = client.get(f"/api/v2/posts/{post_id}").headers["ETag"]
+
+    with count_queries() as statements:
+        response = client.get(f"/api/v2/posts/{post_id}")
+    assert response.headers["ETag"] == etag
+    assert len(statements) == 1
+
+    with count_queries() as statements:
+        response = client.get("/api/v2/users/1")
+    assert response.status_code == 200
+    assert len(statements) == 1
+
+    with count_queries() as statements:
+        response = client.get(
+            f"/api/v2/posts/{post_id}", headers={"If-None-Match": etag}
+        )
+    assert response.status_code == 304
+    assert len(statements) == 1
+
+
+def test_viewer_etag_matches_after_like(client, register):
+    alice = register("alice")
+    bob = register("bob")
+    post_id = create_post(client, alice)
+    client.post(f"/api/v1/posts/{post_id}/like", headers=bob)
+
+    response = client.get(f"/api/v2/posts/{post_id}", headers=bob)
+    assert response.json()["is_liked"] is True
+
+    response = client.get(
+        f"/api/v2/posts/{post_id}",
+        headers={**bob, "If-None-Match": response.headers["ETag"]},
+    )
+    assert response.status_code == 304
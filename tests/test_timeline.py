@@ -0,0 +1,80 @@
+import pytest
+
+from fastapi_app.core.config import settings
+from fastapi_app.services.timeline_service import recent_posts_cache
+
+
+@pytest.fixture
+def feed_users(client, register, monkeypatch):
+    monkeypatch.setattr(settings, "timeline_fanout_threshold", 2)
+    monkeypatch.setattr(recent_posts_cache, "limit", 2)
+    monkeypatch.setattr(recent_posts_cache, "_recent_posts", {})
+
+    users = {name: register(name) for name in ("alice", "bob", "carol", "dave")}
+    for follower in ("bob", "dave"):
+        response = client.post("/api/v1/users/1/follow", headers=users[follower])
+        assert response.status_code == 200, response.text
+    response = client.post("/api/v1/users/3/follow", headers=users["bob"])
+    assert response.status_code == 200, response.text
+    return users
+
+
+def create_posts(client, users, authors):
+    post_ids = []
+    for index, author in enumerate(authors):
+        response = client.post(
+            "/api/v1/posts",
+            json={"content": f"{author} {index}", "images": []},
+            headers=users[author],
+        )
+        assert response.status_code == 201, response.text
+        post_ids.append(response.json()["id"])
+    return post_ids
+
+
+def read_feed_by_cursor(client, headers, per_page):
+    post_ids = []
+    cursor = None
+    while True:
+        params = {"per_page": per_page}
+        if cursor:
+            params["cursor"] = cursor
+        content = client.get("/api/v2/feed", params=params, headers=headers).json()
+        post_ids += [post["id"] for post in content["posts"]]
+        cursor = content["next_cursor"]
+        if cursor is None:
+            return post_ids
+
+
+def test_feed_merges_pull_author_posts_past_cached_window(client, feed_users):
+    authors = ["alice", "carol", "alice", "alice", "carol", "alice", "alice"]
+    post_ids = create_posts(client, feed_users, authors)
+    expected = list(reversed(post_ids))
+
+    assert read_feed_by_cursor(client, feed_users["bob"], per_page=2) == expected
+    assert read_feed_by_cursor(client, feed_users["bob"], per_page=3) == expected
+
+    first = client.get("/api/v2/feed?per_page=2", headers=feed_users["bob"]).json()
+    assert first["total"] == len(post_ids)
+
+
+def test_feed_page_numbers_reach_older_pull_posts(client, feed_users):
+    post_ids = create_posts(client, feed_users, ["alice"] * 5 + ["carol"])
+    expected = list(reversed(post_ids))
+
+    pages = [
+        client.get(
+            f"/api/v2/feed?page={page}&per_page=2", headers=feed_users["bob"]
+        ).json()["posts"]
+        for page in (1, 2, 3)
+    ]
+    assert [post["id"] for posts in pages for post in posts] == expected
+
+
+def test_feed_only_pulls_followed_authors(client, feed_users):
+    create_posts(client, feed_users, ["alice", "carol"])
+
+    content = client.get("/api/v2/feed", headers=feed_users["carol"]).json()
+
+    assert [post["username"] for post in content["posts"]] == ["carol"]
+    assert content["total"] == 1
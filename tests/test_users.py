@@ -0,0 +1,33 @@
+def test_me_reflects_profile_updates(client, register):
+    headers = register("alice")
+
+    me = client.get("/api/v2/users/me", headers=headers).json()
+    assert me == {
+        "id": 1,
+        "username": "alice",
+        "email": "alice@example.com",
+        "full_name": None,
+        "avatar": None,
+        "desc": None,
+    }
+
+    response = client.put(
+        "/api/v1/users/me", json={"full_name": "Alice"}, headers=headers
+    )
+    assert response.json()["data"]["full_name"] == "Alice"
+
+    assert client.get("/api/v1/users/me", headers=headers).json()["data"] == {
+        **me,
+        "full_name": "Alice",
+    }
+    assert client.get("/api/v2/users/1").json()["full_name"] == "Alice"
+
+
+def test_me_rejects_duplicate_username(client, register):
+    register("alice")
+    headers = register("bob")
+
+    response = client.put(
+        "/api/v2/users/me", json={"username": "alice"}, headers=headers
+    )
+    assert response.status_code == 400